@@ -1,8 +1,21 @@
 """apcrg.apcrg: provides entry point main()."""
 
 import argparse
+import atexit
+import hashlib
+import httpx
+import json
+import os
+import re
+import threading
+import time
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urljoin
 from schema_registry.client import SchemaRegistryClient
+from schema_registry.client import status
+from schema_registry.client import utils
+from schema_registry.client.errors import ClientError
 from schema_registry.client.utils import SchemaVersion
 from collections import namedtuple 
 
@@ -11,9 +24,120 @@ SchemaCopyContext = namedtuple("SchemaCopyContext",[
         'dest_registry',
         'source_subject',
         'source_version',
-        'dest_subject'
+        'dest_subject',
+        'dry_run'
+    ], defaults=[False])
+
+SchemaCopyResult = namedtuple("SchemaCopyResult",[
+        'context',
+        'action',
+        'schema_id',
+        'error',
+        'elapsed'
+    ])
+
+SchemaNode = namedtuple("SchemaNode",[
+        'subject',
+        'version',
+        'schema_id',
+        'schema',
+        'schema_type',
+        'references'
     ])
 
+class CachedSchemaRegistryClient(SchemaRegistryClient):
+    def __init__(self, url: str, cache_dir: str = None, latest_ttl: int = 60, **kwargs) -> None:
+        super().__init__(url, **kwargs)
+        self._http_client = httpx.Client(**self.client_kwargs)
+        atexit.register(self._http_client.close)
+        self._cache_dir = None if cache_dir is None else os.path.join(cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest()[:16])
+        self._latest_ttl = latest_ttl
+    
+    def request(self, url: str, method: str = "GET", body: dict = None, headers: dict = None, timeout: any = httpx.USE_CLIENT_DEFAULT) -> httpx.Response:
+        if method not in utils.VALID_METHODS:
+            raise ClientError(f"Method {method} is invalid; valid methods include {utils.VALID_METHODS}")
+        _headers = self.prepare_headers(body=body, headers=headers)
+        return self._http_client.request(method, url, headers=_headers, json=body, timeout=timeout)
+    
+    def _get_cache_path(self, *parts: str) -> str:
+        return os.path.join(self._cache_dir, *[quote(str(part), safe='') for part in parts])
+    
+    def _read_cache(self, path: str) -> any:
+        try:
+            with open(path, 'r') as read_file:
+                return json.load(read_file)
+        except (OSError, ValueError):
+            return None
+    
+    def _write_cache(self, path: str, value: any) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = F"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w') as write_file:
+            json.dump(value, write_file)
+        os.replace(temp_path, path)
+    
+    def _read_cached_schema(self, subject: str, version: any) -> dict or None:
+        if self._cache_dir is None:
+            return None
+        if str(version) == "latest":
+            latest = self._read_cache(self._get_cache_path("subjects", subject, "latest.json"))
+            if (latest is None) or (time.time() - latest["fetched_at"] > self._latest_ttl):
+                return None
+            version = latest["version"]
+        
+        result = self._read_cache(self._get_cache_path("subjects", subject, F"{version}.json"))
+        schema = None if result is None else self._read_cache(self._get_cache_path("schemas", F"{result['schema']}.json"))
+        return None if schema is None else dict(result, schema=schema)
+    
+    def _write_cached_schema(self, version: any, result: dict) -> None:
+        if self._cache_dir is None:
+            return
+        schema_hash = hashlib.sha256(result["schema"].encode('utf-8')).hexdigest()
+        self._write_cache(self._get_cache_path("schemas", F"{schema_hash}.json"), result["schema"])
+        self._write_cache(self._get_cache_path("subjects", result["subject"], F"{result['version']}.json"), dict(result, schema=schema_hash))
+        if str(version) == "latest":
+            self._write_cache(self._get_cache_path("subjects", result["subject"], "latest.json"), {"version": result["version"], "fetched_at": time.time()})
+    
+    def get_schema_result(self, subject: str, version: any = "latest") -> dict or None:
+        result = self._read_cached_schema(subject, version)
+        if result is not None:
+            return result
+        
+        response = self.request(urljoin(self.url_manager.url, F"subjects/{quote(subject, safe='')}/versions/{version}"))
+        if not status.is_success(response.status_code):
+            return None
+        result = response.json()
+        self._write_cached_schema(version, result)
+        return result
+    
+    def get_schema(self, subject: str, version: any = "latest", headers: dict = None, timeout: any = httpx.USE_CLIENT_DEFAULT) -> SchemaVersion or None:
+        result = self.get_schema_result(subject, version)
+        if result is None:
+            return None
+        
+        schema_id = result.get("id")
+        schema = self.id_to_schema[schema_id] if schema_id in self.id_to_schema else self._schema_from_result(result)
+        self._cache_schema(schema, schema_id, subject, result["version"])
+        return SchemaVersion(subject, schema_id, schema, result["version"])
+
+    def register_new(self, subject: str, schema: any) -> int:
+        response = self.request(urljoin(self.url_manager.url, F"subjects/{quote(subject, safe='')}/versions"), method="POST", body={"schema": json.dumps(schema.raw_schema), "schemaType": schema.schema_type})
+        if not status.is_success(response.status_code):
+            raise ClientError("Unable to register schema", http_code=response.status_code, server_traceback=response.text)
+        schema_id = response.json()["id"]
+        self._cache_schema(schema, schema_id, subject)
+        return schema_id
+
+registry_clients = dict()
+registry_clients_lock = threading.Lock()
+
+def get_registry_client(url: str, cache_dir: str = None, latest_ttl: int = 60) -> CachedSchemaRegistryClient:
+    with registry_clients_lock:
+        key = (url, cache_dir, latest_ttl)
+        if key not in registry_clients:
+            registry_clients[key] = CachedSchemaRegistryClient(url, cache_dir=cache_dir, latest_ttl=latest_ttl)
+        return registry_clients[key]
+
 def read_batch_config(file:str) -> any:
     with open(file, 'r') as read_file:
         return yaml.safe_load(read_file)
@@ -23,11 +147,12 @@ def process_cp(args: any):
     assert (args.dest_schema and args.dest_schema.strip()), "destination schema registry uri is invalid"
     
     context: SchemaCopyContext = SchemaCopyContext(
-        source_registry=SchemaRegistryClient(args.source_schema),
-        dest_registry=SchemaRegistryClient(args.dest_schema),
+        source_registry=get_registry_client(args.source_schema, cache_dir=args.cache_dir, latest_ttl=args.latest_ttl),
+        dest_registry=get_registry_client(args.dest_schema),
         source_subject=args.source_subject,
         source_version=args.source_version,
-        dest_subject=args.dest_subject
+        dest_subject=args.dest_subject,
+        dry_run=args.dry_run
     )
     
     copy_schema(context)
@@ -40,20 +165,78 @@ def process_cp_batch(args):
     batch_config = read_batch_config(args.file)
     assert "schemas" in batch_config, "yaml file does not contain an array of 'schemas'"
     
-    source_registry=SchemaRegistryClient(args.source_schema)
-    dest_registry=SchemaRegistryClient(args.dest_schema)
-            
+    assert args.parallelism > 0, "parallelism must be greater than 0"
+    
+    source_registry=get_registry_client(args.source_schema, cache_dir=args.cache_dir, latest_ttl=args.latest_ttl)
+    dest_registry=get_registry_client(args.dest_schema)
+    
+    contexts = []
     for schema in batch_config.get("schemas"):
-        context: SchemaCopyContext = SchemaCopyContext(
+        contexts.append(SchemaCopyContext(
             source_registry=source_registry,
             dest_registry=dest_registry,
             source_subject=schema.get("source-subject"),
             source_version=schema.get("source-version"),
-            dest_subject=schema.get("dest-subject")
-        )
-        
-        copy_schema(context)
-        
+            dest_subject=schema.get("dest-subject"),
+            dry_run=args.dry_run
+        ))
+    
+    subject_contexts = dict()
+    for index, context in enumerate(contexts):
+        dest_subject = context.source_subject if context.dest_subject is None else context.dest_subject
+        subject_contexts.setdefault(dest_subject, []).append((index, context))
+    
+    results = [None] * len(contexts)
+    with ThreadPoolExecutor(max_workers=args.parallelism) as executor:
+        for subject_results in executor.map(try_copy_subject_schemas, subject_contexts.values()):
+            for index, result in subject_results:
+                results[index] = result
+    
+    print_batch_results(results)
+    failed = [result for result in results if result.error is not None]
+    assert len(failed) == 0, f"{len(failed)} of {len(results)} schemas failed to copy"
+    
+def try_copy_subject_schemas(indexed_contexts: list) -> list:
+    return [(index, try_copy_schema(context)) for index, context in indexed_contexts]
+    
+def try_copy_schema(schema_copy_context: SchemaCopyContext) -> SchemaCopyResult:
+    started = time.monotonic()
+    try:
+        action, schema_id = sync_schema(schema_copy_context)
+        return SchemaCopyResult(context=schema_copy_context, action=action, schema_id=schema_id, error=None, elapsed=time.monotonic() - started)
+    except Exception as e:
+        print(F" - failed [{schema_copy_context.source_subject}]: [{str(e)}]")
+        return SchemaCopyResult(context=schema_copy_context, action="failed", schema_id=None, error=str(e), elapsed=time.monotonic() - started)
+    
+def print_batch_results(results: list):
+    rows = [["subject", "destination", "result", "time"]]
+    for result in results:
+        source_version = "latest" if result.context.source_version is None else result.context.source_version
+        dest_subject = result.context.source_subject if result.context.dest_subject is None else result.context.dest_subject
+        outcome = F"failed: {result.error}" if result.error is not None else (result.action if result.schema_id is None else F"{result.action}: [{result.schema_id}]")
+        rows.append([F"{result.context.source_subject}:{source_version}", dest_subject, outcome, F"{result.elapsed:.2f}s"])
+    
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        print("  ".join(str(row[i]).ljust(widths[i]) for i in range(len(row))).rstrip())
+    
+def process_mirror(args):
+    assert (args.source_schema and args.source_schema.strip()), "source schema registry uri is invalid"
+    assert (args.dest_schema and args.dest_schema.strip()), "destination schema registry uri is invalid"
+    assert args.parallelism > 0, "parallelism must be greater than 0"
+    
+    results = mirror_registry(
+        source_registry=get_registry_client(args.source_schema, cache_dir=args.cache_dir, latest_ttl=args.latest_ttl),
+        dest_registry=get_registry_client(args.dest_schema),
+        include=args.include,
+        exclude=args.exclude,
+        parallelism=args.parallelism,
+        dry_run=args.dry_run,
+        preserve_ids=args.preserve_ids
+    )
+    
+    failed = [node for node, result in results.items() if result.startswith("failed")]
+    assert len(failed) == 0, f"{len(failed)} of {len(results)} schema versions failed to mirror"
     
 def parse_args():
     argparser = argparse.ArgumentParser(description='Apicurio schema registry utility set')
@@ -65,16 +248,46 @@ def parse_args():
     cp.add_argument('--source-subject', required=True, help='The subject to copy from')
     cp.add_argument('--source-version', required=False, default="latest", help='The subject version that needs to be copied. default: latest')
     cp.add_argument('--dest-subject', required=False, help='The subject to copy to')
+    cp.add_argument('--dry-run', action='store_true', help='Print whether the schema would be registered without writing to the destination')
+    cp.add_argument('--cache-dir', required=False, default=os.environ.get("APCRG_CACHE_DIR"), help='Directory caching source schemas across invocations. default: $APCRG_CACHE_DIR')
+    cp.add_argument('--latest-ttl', type=int, required=False, default=60, help="Seconds a cached 'latest' source version stays valid. default: 60")
     cp.set_defaults(func=process_cp)
     
     batch_cp = subparsers.add_parser("cp-batch", help="Reads a yaml file containing a batch of schemas to copy")
     batch_cp.add_argument('--source-schema', required=True, help='Source schema registry uri')
     batch_cp.add_argument('--dest-schema', required=True, help='Destination schema registry uri')
     batch_cp.add_argument('--file', required=True, help="The yaml file containing the list of subjects to transfer")
+    batch_cp.add_argument('--dry-run', action='store_true', help='Print which schemas would be registered without writing to the destination')
+    batch_cp.add_argument('--parallelism', type=int, required=False, default=1, help='Number of schemas copied concurrently. default: 1')
+    batch_cp.add_argument('--cache-dir', required=False, default=os.environ.get("APCRG_CACHE_DIR"), help='Directory caching source schemas across invocations. default: $APCRG_CACHE_DIR')
+    batch_cp.add_argument('--latest-ttl', type=int, required=False, default=60, help="Seconds a cached 'latest' source version stays valid. default: 60")
     batch_cp.set_defaults(func=process_cp_batch)
+    
+    mirror = subparsers.add_parser("mirror", help="Mirror every subject version missing in the destination, dependencies first")
+    mirror.add_argument('--source-schema', required=True, help='Source schema registry uri')
+    mirror.add_argument('--dest-schema', required=True, help='Destination schema registry uri')
+    mirror.add_argument('--include', required=False, help='Only mirror subjects matching this regex')
+    mirror.add_argument('--exclude', required=False, help='Skip subjects matching this regex')
+    mirror.add_argument('--parallelism', type=int, required=False, default=8, help='Number of concurrent registry requests. default: 8')
+    mirror.add_argument('--preserve-ids', action='store_true', help='Register with the source id and version (the destination must be in IMPORT mode)')
+    mirror.add_argument('--dry-run', action='store_true', help='Print the versions that would be registered without writing to the destination')
+    mirror.add_argument('--cache-dir', required=False, default=os.environ.get("APCRG_CACHE_DIR"), help='Directory caching source schemas across invocations. default: $APCRG_CACHE_DIR')
+    mirror.add_argument('--latest-ttl', type=int, required=False, default=60, help="Seconds a cached 'latest' source version stays valid. default: 60")
+    mirror.set_defaults(func=process_mirror)
     return argparser.parse_args()
 
-def copy_schema(schema_copy_context: SchemaCopyContext) -> int :
+def get_schema_fingerprint(schema: any, schema_type: str = None) -> str:
+    raw_schema = getattr(schema, "raw_schema", schema)
+    schema_type = schema_type or getattr(schema, "schema_type", "AVRO")
+    if schema_type in ["AVRO", "JSON"]:
+        if isinstance(raw_schema, str):
+            raw_schema = json.loads(raw_schema)
+        canonical_schema = json.dumps(raw_schema, sort_keys=True, separators=(',', ':'))
+    else:
+        canonical_schema = raw_schema if isinstance(raw_schema, str) else str(raw_schema)
+    return F"{schema_type}:{hashlib.sha256(canonical_schema.encode('utf-8')).hexdigest()}"
+
+def sync_schema(schema_copy_context: SchemaCopyContext) -> tuple :
     assert schema_copy_context is not None, "schema copy context is null"
     assert schema_copy_context.source_registry is not None, "source schema registry is null"
     assert schema_copy_context.dest_registry is not None, "destination schema registry is null"
@@ -85,10 +298,188 @@ def copy_schema(schema_copy_context: SchemaCopyContext) -> int :
     
     print(F"copying subject [{schema_copy_context.source_subject}:{source_version}] to [{dest_subject}]")
     source_schema: SchemaVersion = schema_copy_context.source_registry.get_schema(subject=f"{schema_copy_context.source_subject}",version=f"{source_version}")
-    schema_id = schema_copy_context.dest_registry.register(subject=dest_subject, schema=source_schema.schema)
+    assert source_schema is not None, f"source subject [{schema_copy_context.source_subject}:{source_version}] was not found"
+    
+    dest_schema: SchemaVersion = schema_copy_context.dest_registry.check_version(dest_subject, source_schema.schema)
+    if dest_schema is not None:
+        print(F" - unchanged: [{dest_schema.schema_id}]")
+        return "unchanged", dest_schema.schema_id
+    
+    if schema_copy_context.dry_run:
+        print(F" - would register")
+        return "would register", None
+    
+    schema_id = schema_copy_context.dest_registry.register_new(dest_subject, source_schema.schema)
     print(F" - done: [{schema_id}]")
     
-    return schema_id
+    return "done", schema_id
+    
+def copy_schema(schema_copy_context: SchemaCopyContext) -> int :
+    return sync_schema(schema_copy_context)[1]
+    
+def registry_request(registry: SchemaRegistryClient, path: str, method: str = "GET", body: dict = None) -> tuple:
+    response = registry.request(urljoin(registry.url_manager.url, path), method=method, body=body)
+    try:
+        result = response.json()
+    except ValueError:
+        result = None
+    return result, response.status_code
+    
+def get_schema_node(result: dict) -> SchemaNode:
+    return SchemaNode(
+        subject=result["subject"],
+        version=result["version"],
+        schema_id=result["id"],
+        schema=result["schema"],
+        schema_type=result.get("schemaType") or "AVRO",
+        references=tuple((reference["name"], reference["subject"], reference["version"]) for reference in result.get("references") or [])
+    )
+    
+def get_node_fingerprint(node: SchemaNode) -> str:
+    references = [F"{name}={subject}" for name, subject, _ in node.references]
+    return F"{get_schema_fingerprint(node.schema, node.schema_type)}:{node.schema_type}:{','.join(references)}"
+    
+def fetch_schema_version(registry: CachedSchemaRegistryClient, subject: str, version: int) -> SchemaNode:
+    result = registry.get_schema_result(subject, version)
+    if result is None:
+        raise Exception(F"Unable to get schema [{subject}:{version}]")
+    return get_schema_node(result)
+    
+def fetch_subject_versions(registry: SchemaRegistryClient, subject: str) -> list:
+    result, code = registry_request(registry, F"subjects/{quote(subject, safe='')}/versions")
+    if code == status.HTTP_404_NOT_FOUND:
+        return []
+    if not status.is_success(code):
+        raise Exception(F"Unable to get versions of subject [{subject}]: {code}")
+    return [fetch_schema_version(registry, subject, version) for version in result]
+    
+def fetch_registry_schemas(registry: SchemaRegistryClient, subjects: list, parallelism: int) -> dict:
+    subjects = set(subjects)
+    result, code = registry_request(registry, "schemas")
+    if status.is_success(code) and isinstance(result, list) and all(("subject" in item) and ("version" in item) for item in result):
+        nodes = [get_schema_node(item) for item in result if item["subject"] in subjects]
+    else:
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            nodes = [node for subject_nodes in executor.map(lambda subject: fetch_subject_versions(registry, subject), sorted(subjects)) for node in subject_nodes]
+    return {(node.subject, node.version): node for node in nodes}
+    
+def resolve_references(registry: SchemaRegistryClient, nodes: dict, parallelism: int) -> dict:
+    missing = {reference[1:] for node in nodes.values() for reference in node.references} - set(nodes)
+    while len(missing) > 0:
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            for node in executor.map(lambda key: fetch_schema_version(registry, *key), sorted(missing)):
+                nodes[(node.subject, node.version)] = node
+        missing = {reference[1:] for node in nodes.values() for reference in node.references} - set(nodes)
+    return nodes
+    
+def plan_mirror(source_nodes: dict, dest_nodes: dict, preserve_ids: bool = False) -> tuple:
+    dest_fingerprints = dict()
+    for node in dest_nodes.values():
+        dest_fingerprints.setdefault(node.subject, dict())[get_node_fingerprint(node)] = node.version
+    
+    version_map = dict()
+    missing = []
+    for key in sorted(source_nodes):
+        dest_version = dest_fingerprints.get(key[0], dict()).get(get_node_fingerprint(source_nodes[key]))
+        if dest_version is None:
+            missing.append(key)
+        else:
+            version_map[key] = dest_version
+    
+    skipped = []
+    if not preserve_ids:
+        newest_versions = dict()
+        for subject, version in version_map:
+            newest_versions[subject] = max(version, newest_versions.get(subject, version))
+        skipped = [key for key in missing if key[1] < newest_versions.get(key[0], key[1])]
+        missing = [key for key in missing if key not in skipped]
+    
+    levels = dict()
+    previous_versions = dict()
+    for previous_key, key in zip([None] + missing, missing):
+        previous_versions[key] = [previous_key] if (previous_key is not None) and (previous_key[0] == key[0]) else []
+    
+    def get_level(key: tuple, visiting: set) -> int:
+        if key in levels:
+            return levels[key]
+        assert key not in visiting, F"schema references of [{key[0]}:{key[1]}] are cyclic"
+        visiting.add(key)
+        dependencies = [reference[1:] for reference in source_nodes[key].references if reference[1:] in previous_versions] + previous_versions[key]
+        levels[key] = 1 + max([get_level(dependency, visiting) for dependency in dependencies], default=-1)
+        visiting.remove(key)
+        return levels[key]
+    
+    plan = []
+    for key in missing:
+        level = get_level(key, set())
+        while len(plan) <= level:
+            plan.append([])
+        plan[level].append(key)
+    
+    return plan, version_map, skipped
+    
+def register_schema_node(registry: SchemaRegistryClient, node: SchemaNode, version_map: dict, preserve_ids: bool) -> int:
+    body = {
+        "schema": node.schema,
+        "schemaType": node.schema_type,
+        "references": [{"name": name, "subject": subject, "version": version_map[(subject, version)]} for name, subject, version in node.references]
+    }
+    if preserve_ids:
+        body["id"] = node.schema_id
+        body["version"] = node.version
+    
+    result, code = registry_request(registry, F"subjects/{quote(node.subject, safe='')}/versions", method="POST", body=body)
+    if not status.is_success(code):
+        raise Exception(F"Unable to register schema [{node.subject}:{node.version}]: {code} {result}")
+    
+    body.pop("id", None)
+    body.pop("version", None)
+    result, code = registry_request(registry, F"subjects/{quote(node.subject, safe='')}", method="POST", body=body)
+    if not status.is_success(code):
+        raise Exception(F"Unable to look up registered schema [{node.subject}:{node.version}]: {code} {result}")
+    return result["version"]
+    
+def mirror_registry(source_registry: SchemaRegistryClient, dest_registry: SchemaRegistryClient, include: str = None, exclude: str = None, parallelism: int = 8, dry_run: bool = False, preserve_ids: bool = False) -> dict:
+    subjects, code = registry_request(source_registry, "subjects")
+    assert status.is_success(code), F"unable to list source subjects: {code}"
+    subjects = [subject for subject in subjects if ((include is None) or re.search(include, subject)) and ((exclude is None) or not re.search(exclude, subject))]
+    print(F"mirroring [{len(subjects)}] subjects")
+    
+    source_nodes = resolve_references(source_registry, fetch_registry_schemas(source_registry, subjects, parallelism), parallelism)
+    dest_subjects, code = registry_request(dest_registry, "subjects")
+    assert status.is_success(code), F"unable to list destination subjects: {code}"
+    dest_nodes = fetch_registry_schemas(dest_registry, set(dest_subjects) & {key[0] for key in source_nodes}, parallelism)
+    
+    plan, version_map, skipped = plan_mirror(source_nodes, dest_nodes, preserve_ids)
+    results = {key: "unchanged" for key in version_map}
+    for key in skipped:
+        results[key] = "skipped: older than the newest version already in the destination"
+        print(F" - warning: [{key[0]}:{key[1]}] is older than the newest version of [{key[0]}] already in the destination, skipping (use --preserve-ids to backfill)")
+    print(F" - [{len(version_map)}] versions already present, [{sum(len(level) for level in plan)}] to register in [{len(plan)}] steps")
+    
+    def register(key: tuple) -> tuple:
+        node = source_nodes[key]
+        failed_dependencies = [reference[1:] for reference in node.references if results.get(reference[1:], "").startswith(("failed", "skipped"))]
+        if len(failed_dependencies) > 0:
+            return key, None, F"failed: dependency [{failed_dependencies[0][0]}:{failed_dependencies[0][1]}] was not mirrored"
+        if dry_run:
+            return key, None, "would register"
+        try:
+            return key, register_schema_node(dest_registry, node, version_map, preserve_ids), "done"
+        except Exception as e:
+            return key, None, F"failed: {str(e)}"
+    
+    for level in plan:
+        with ThreadPoolExecutor(max_workers=parallelism) as executor:
+            for key, dest_version, result in executor.map(register, level):
+                results[key] = result
+                if dest_version is not None:
+                    version_map[key] = dest_version
+                elif dry_run:
+                    version_map[key] = key[1]
+                print(F" - [{key[0]}:{key[1]}] {result}")
+    
+    return results
     
 def main():
     try:
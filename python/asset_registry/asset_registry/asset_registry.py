@@ -3,30 +3,96 @@
 __version__ = "1.0.0"
 
 import argparse
-from dateutil import parser
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from kubernetes.client.rest import RESTResponse
 from .k8s.K8sManager import K8sManager
 from .car.AssetRegistryManager import AssetRegistryManager
+from .car.ImagePlan import ImagePlan
 from .k8s import PodHelper
+from .k8s.HelmReleaseTracker import HelmReleaseTracker
 from .dkr.DockerManager import DockerManager
+from .dkr.ImagePipeline import ImagePipeline
+from .dkr.ImageMetadataCache import ImageMetadataCache
+from .dkr.RetryPolicy import RetryPolicy
+from .prf.RunProfiler import RunProfiler
 
 def parse_args():
     argparser = argparse.ArgumentParser(description='Update k8s Registry CSV File')
     argparser.add_argument('--csv', required=True, help='CSV file to load / update data to')
+    argparser.add_argument('--snapshot', action='store_true', help='List pods and deployments once per cluster and resolve chart pods from an in-memory index')
+    argparser.add_argument('--workers', type=int, default=1, help='Number of concurrent image registry lookups and pulls. default: 1')
+    argparser.add_argument('--registry-workers', type=int, default=4, help='Maximum concurrent lookups and pulls against a single registry. default: 4')
+    argparser.add_argument('--pull', action='store_true', help='Pull images to read their created date instead of fetching the manifest and config blob from the registry')
+    argparser.add_argument('--cache', required=False, help='SQLite file caching image tag digests and created dates across runs')
+    argparser.add_argument('--cache-ttl', type=int, default=86400, help='Seconds a cached image tag to digest resolution stays valid. default: 86400')
+    argparser.add_argument('--retries', type=int, default=5, help='Maximum attempts for a retryable registry lookup or pull. default: 5')
+    argparser.add_argument('--state', required=False, help='JSON file holding Helm resources and resourceVersions; only releases changed since the previous run are recomputed')
+    argparser.add_argument('--watch-timeout', type=int, default=5, help='Seconds to wait for changes on each resource watch in incremental mode. default: 5')
+    argparser.add_argument('--contexts', required=False, help="Comma separated kubeconfig contexts to scan concurrently, or 'all'. default: current context")
+    argparser.add_argument('--split-clusters', action='store_true', help='Write one CSV per context (<csv>-<context>.csv) instead of a merged CSV with a cluster column')
+    argparser.add_argument('--k8s-concurrency', type=int, default=1, help='Number of concurrent Kubernetes list calls and release pod lookups per cluster. default: 1')
+    argparser.add_argument('--k8s-qps', type=float, default=100, help='Maximum Kubernetes API requests per second per cluster when --k8s-concurrency is greater than 1. default: 100')
+    argparser.add_argument('--k8s-burst', type=int, default=200, help='Kubernetes API requests allowed above --k8s-qps in a burst. default: 200')
+    argparser.add_argument('--jsonl', required=False, help='Also write the registry as JSON Lines to this file (one file per context with --split-clusters)')
+    argparser.add_argument('--parquet', required=False, help='Also write the registry as Parquet to this file; requires pyarrow (one file per context with --split-clusters)')
+    argparser.add_argument('--delta', required=False, help='Write the rows added, removed, digest-changed and verification-changed since the previous CSV to this JSON Lines file')
+    argparser.add_argument('--profile', action='store_true', help='Print per-phase timings, API call counts, bytes transferred and cache hit rates')
+    argparser.add_argument('--profile-json', required=False, help='Write the profile report to this JSON file')
+    argparser.add_argument('--profile-prom', required=False, help='Write the profile report to this Prometheus textfile')
     return argparser.parse_args()
 
-def main():
-    args = parse_args()
-    k8 = K8sManager()
-    dkr = DockerManager()
+def get_cluster_file_path(file_path: str, cluster: str) -> str:
+    root, ext = os.path.splitext(file_path)
+    return f"{root}-{re.sub(r'[^A-Za-z0-9_.-]+', '_', cluster)}{ext}"
+
+def get_response_size(response) -> int:
+    if isinstance(response, RESTResponse):
+        return len(response.data or '')
+    return int(getattr(response, 'headers', None) and response.headers.get('Content-Length') or 0)
+
+def profile_cluster(profiler: RunProfiler, k8: K8sManager) -> None:
+    if not profiler.enabled:
+        return
+    profiler.instrument(k8, ['get_all_helm_deployments', 'list_helm_resources', 'list_resource_metadata', 'watch_changes', 'load_snapshot', 'find_chart_pods', 'find_chart_deployment_pods'], 'k8s')
+    rest_clients = dict()
+    for api in k8.get_apis():
+        profiler.instrument_api(api, 'k8s.api')
+        rest_client = getattr(getattr(api, 'api_client', None), 'rest_client', None)
+        if rest_client is not None:
+            rest_clients[id(rest_client)] = rest_client
+    for rest_client in rest_clients.values():
+        profiler.instrument_bytes(rest_client, 'request', 'k8s.api.bytes', get_response_size)
+
+def profile_images(profiler: RunProfiler, dkr: DockerManager, cache: ImageMetadataCache) -> None:
+    if not profiler.enabled:
+        return
+    profiler.instrument(cache, ['get_tag_digest', 'get_digest_created'], 'cache', hit_test=lambda result: result is not None)
+    profiler.instrument(dkr, ['get_image_registry_data', 'pull_image', 'get_image_metadata', 'get_image_digest', 'get_image_created'], 'docker')
+    dkr.add_registry_response_hook(lambda response, *args, **kwargs: profiler.count('registry.bytes', len(response.content or b'')))
 
-    source_car = AssetRegistryManager()
-    source_car.load_csv(args.csv)
+def scan_cluster(args, context: str, cluster: str, source_car: AssetRegistryManager, profiler: RunProfiler) -> tuple:
+    throttled = args.k8s_concurrency > 1
+    k8 = K8sManager(snapshot=args.snapshot, context=context, concurrency=args.k8s_concurrency, qps=args.k8s_qps if throttled else None, burst=args.k8s_burst if throttled else None)
+    profile_cluster(profiler, k8)
+    state_path = args.state if (args.state is None) or (context is None) else get_cluster_file_path(args.state, context)
+    tracker = HelmReleaseTracker(k8, state_path, watch_timeout=args.watch_timeout) if state_path else None
+    if tracker is not None:
+        profiler.instrument(tracker, ['sync'], 'k8s.tracker')
+    deployments = k8.get_all_helm_deployments() if tracker is None else tracker.sync()
 
-    dest_car = AssetRegistryManager()
-    deployments = k8.get_all_helm_deployments()
+    def scan_release(deployment) -> list:
+        rows = []
+        if (tracker is not None) and not tracker.is_release_changed(deployment.namespace, deployment.name):
+            release_assets = source_car.get_release_assets(deployment.namespace, deployment.name)
+            release_assets = [asset for asset in release_assets if asset.cluster == cluster]
+            if len(release_assets) > 0:
+                return [(asset, None) for asset in release_assets]
 
-    for deployment in deployments:
         deployment_row = dict()
+        if cluster is not None:
+            deployment_row[AssetRegistryManager.CLUSTER_KEY] = cluster
         deployment_row[AssetRegistryManager.NAMESPACE_KEY] = deployment.namespace
         deployment_row[AssetRegistryManager.ARTIFACT_KEY] = deployment.name
         deployment_row[AssetRegistryManager.VERSION_KEY] = deployment.version
@@ -36,43 +102,122 @@ def main():
             pods = k8.find_chart_deployment_pods(deployment.name, deployment.namespace)
 
         if (len(pods) == 0):
-            dest_car.set_asset(deployment_row)
-            print(deployment_row)
+            rows.append((deployment_row, None))
         else:
             for pod in pods:
                 containers = PodHelper.get_container_image_details(pod)
                 if (len(containers) == 0):
-                    dest_car.set_asset(deployment_row)
-                    print(deployment_row)
+                    rows.append((deployment_row, None))
                 else:
                     for container in PodHelper.get_container_image_details(pod):
                         deployment_container_row = dict(deployment_row)
                         deployment_container_row[AssetRegistryManager.CONTAINER_NAME_KEY] = container.name
                         deployment_container_row[AssetRegistryManager.CONTAINER_IMAGE_KEY] = container.image
                         deployment_container_row[AssetRegistryManager.CONTAINER_IMAGE_ID_KEY] = container.digest
+                        rows.append((deployment_container_row, container))
+
+        return rows
+
+    rows = [row for release_rows in k8.map(scan_release, deployments) for row in release_rows]
+    return rows, tracker
+
+def main():
+    args = parse_args()
+    assert (args.parquet is None) or AssetRegistryManager.PARQUET_SUPPORTED, "--parquet requires pyarrow (pip install pyarrow)"
+    profiler = RunProfiler(enabled=args.profile or (args.profile_json is not None) or (args.profile_prom is not None))
+    cache = ImageMetadataCache(args.cache or ':memory:', tag_ttl=args.cache_ttl)
+    dkr = DockerManager(metadata_only=not args.pull, cache=cache, retry_policy=RetryPolicy(max_attempts=args.retries))
+    profile_images(profiler, dkr, cache)
+    pipeline = ImagePipeline(workers=args.workers, registry_workers=args.registry_workers)
+
+    if args.contexts is None:
+        contexts = [None]
+    elif args.contexts == 'all':
+        contexts = K8sManager.list_contexts()
+    else:
+        contexts = [context.strip() for context in args.contexts.split(',') if context.strip()]
+    assert len(contexts) > 0, "no kubeconfig contexts to scan"
+
+    merged = (args.contexts is None) or not args.split_clusters
+    csv_paths = {context: args.csv if merged else get_cluster_file_path(args.csv, context) for context in contexts}
+    source_cars = dict()
+    dest_cars = dict()
+    for csv_path in dict.fromkeys(csv_paths.values()):
+        source_cars[csv_path] = AssetRegistryManager()
+        with profiler.phase('csv.load'):
+            source_cars[csv_path].load_csv(csv_path)
+        dest_cars[csv_path] = AssetRegistryManager(include_cluster=(args.contexts is not None) and merged)
+
+    def scan(context: str) -> tuple:
+        cluster = context if (args.contexts is not None) and merged else None
+        with profiler.phase('k8s.scan'):
+            return scan_cluster(args, context, cluster, source_cars[csv_paths[context]], profiler)
+
+    with profiler.phase('k8s.scan_all'):
+        with ThreadPoolExecutor(max_workers=len(contexts)) as executor:
+            scans = dict(zip(contexts, executor.map(scan, contexts)))
+
+    plan = ImagePlan()
+    with profiler.phase('docker.plan'):
+        for context in contexts:
+            source_car = source_cars[csv_paths[context]]
+            for row, container in scans[context][0]:
+                if container is not None:
+                    plan.add(row, container.image, container.digest, source_car.get_asset(row))
+
+    lookup_functions = {ImagePlan.DIGEST_LOOKUP: dkr.get_image_digest, ImagePlan.CREATED_LOOKUP: dkr.get_image_created}
+    tasks = [(lookup_functions[lookup], image) for lookup, image in plan.get_lookups()]
+    for function, image in tasks:
+        if function == dkr.get_image_digest:
+            print(f"Loading [{image}] image registry data")
+        else:
+            print(f"Loading [{image}] image created date")
+    summary = plan.get_summary()
+    print(f"Images: {summary['pairs']} unique image digests ({summary['images']} image references) across {summary['containers']} containers, {summary['lookups']} registry lookups")
+    with profiler.phase('docker.pipeline'):
+        results = pipeline.run(tasks)
 
-                        source_deployment_container_row = source_car.get_asset(deployment_container_row)
+    retry_stats = dkr.retry_policy.get_stats().values()
+    print(f"Registry calls: {sum(stats['calls'] for stats in retry_stats)}, attempts: {sum(stats['attempts'] for stats in retry_stats)}, failures: {sum(stats['failures'] for stats in retry_stats)}")
+    plan.resolve({(lookup, image): results.get((lookup_functions[lookup], image)) for lookup, image in plan.get_lookups()})
 
-                        if (source_deployment_container_row != None) and (source_deployment_container_row.get(AssetRegistryManager.CONTAINER_IMAGE_ID_KEY) == container.digest):
-                            deployment_container_row[AssetRegistryManager.CONTAINER_VERIFIED_KEY] = "Valid"
-                        else:
-                            print(f"Loading [{container.image}] image registry data")
-                            registry_data = dkr.get_image_registry_data(container.image)
-                            digest_valid = "Valid" if (registry_data is not None) and (registry_data.id == container.digest) else "Invalid"
-                            deployment_container_row[AssetRegistryManager.CONTAINER_VERIFIED_KEY] = digest_valid
+    for context in contexts:
+        dest_car = dest_cars[csv_paths[context]]
+        for row, _ in scans[context][0]:
+            dest_car.set_asset(row)
+            print(row)
 
-                        if (source_deployment_container_row != None) and (source_deployment_container_row.get(AssetRegistryManager.CONTAINER_UPDATED_KEY) is not None) and (len(source_deployment_container_row.get(AssetRegistryManager.CONTAINER_UPDATED_KEY)) > 0):
-                            deployment_container_row[AssetRegistryManager.CONTAINER_UPDATED_KEY] = source_deployment_container_row[AssetRegistryManager.CONTAINER_UPDATED_KEY]
-                        else:
-                            print(f"Pulling [{container.image}] image")
-                            img = dkr.pull_image(container.image)
-                            created_date = None if img is None else img.attrs.get('Created')
-                            deployment_container_row[AssetRegistryManager.CONTAINER_UPDATED_KEY] = '' if created_date is None else str(parser.parse(created_date).date())
+    def get_export_path(file_path: str, csv_path: str) -> str:
+        context = next(context for context in contexts if csv_paths[context] == csv_path)
+        return file_path if merged else get_cluster_file_path(file_path, context)
 
-                        dest_car.set_asset(deployment_container_row)
-                        print(deployment_container_row)
+    for csv_path, dest_car in dest_cars.items():
+        if args.delta:
+            with profiler.phase('delta.save'):
+                counts = dest_car.save_delta(get_export_path(args.delta, csv_path), source_cars[csv_path])
+            print(f"Delta [{csv_path}]: {', '.join(f'{count} {change}' for change, count in counts.items())}")
+        with profiler.phase('csv.save'):
+            dest_car.save_csv(csv_path)
+        if args.jsonl:
+            with profiler.phase('jsonl.save'):
+                dest_car.save_jsonl(get_export_path(args.jsonl, csv_path))
+        if args.parquet:
+            with profiler.phase('parquet.save'):
+                dest_car.save_parquet(get_export_path(args.parquet, csv_path))
+    for context in contexts:
+        tracker = scans[context][1]
+        if tracker is not None:
+            tracker.save_state()
 
-    dest_car.save_csv(args.csv)
+    for stats in retry_stats:
+        profiler.count('docker.retry.attempts', stats['attempts'])
+        profiler.count('docker.retry.failures', stats['failures'])
+    if args.profile:
+        profiler.print_report()
+    if args.profile_json:
+        profiler.save_json(args.profile_json)
+    if args.profile_prom:
+        profiler.save_prometheus(args.profile_prom)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,61 @@
+class AssetRecord:
+    FIELDS = ['cluster', 'namespace', 'artifact', 'version', 'chart', 'container', 'updated', 'image', 'digest', 'digest_verified']
+    CSV_FIELDS = FIELDS[1:]
+    FINGERPRINT_FIELDS = ['cluster', 'namespace', 'artifact', 'version', 'container']
+
+    __slots__ = FIELDS + ['fingerprint']
+
+    def __init__(self, **values) -> None:
+        super().__init__()
+        for field in AssetRecord.FIELDS:
+            object.__setattr__(self, field, values.get(field))
+        self._update_fingerprint()
+
+    def _update_fingerprint(self) -> None:
+        object.__setattr__(self, 'fingerprint', AssetRecord.get_fingerprint(self))
+
+    @staticmethod
+    def get_fingerprint(asset) -> str:
+        fingerprint = f"{asset.get('namespace') or ''}-{asset.get('artifact') or ''}-{asset.get('version') or ''}-{asset.get('container') or ''}"
+        return fingerprint if not asset.get('cluster') else f"{asset.get('cluster')}-{fingerprint}"
+
+    @staticmethod
+    def from_dict(asset: dict) -> 'AssetRecord':
+        return asset if isinstance(asset, AssetRecord) else AssetRecord(**asset)
+
+    @staticmethod
+    def from_row(header: list, row: list) -> 'AssetRecord':
+        return AssetRecord(**{header[i]: None if i>=len(row) else row[i] for i in range(len(header))})
+
+    def __setattr__(self, field: str, value: any) -> None:
+        object.__setattr__(self, field, value)
+        if field in AssetRecord.FINGERPRINT_FIELDS:
+            self._update_fingerprint()
+
+    def __getitem__(self, field: str) -> any:
+        if field not in AssetRecord.FIELDS:
+            raise KeyError(field)
+        return getattr(self, field)
+
+    def __setitem__(self, field: str, value: any) -> None:
+        if field not in AssetRecord.FIELDS:
+            raise KeyError(field)
+        setattr(self, field, value)
+
+    def __eq__(self, other: any) -> bool:
+        if not isinstance(other, AssetRecord):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in AssetRecord.FIELDS)
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def get(self, field: str, default: any = None) -> any:
+        value = getattr(self, field, None) if field in AssetRecord.FIELDS else None
+        return default if value is None else value
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in AssetRecord.FIELDS}
+
+    def to_row(self, fields: list = CSV_FIELDS) -> list:
+        return [getattr(self, field) or '' for field in fields]
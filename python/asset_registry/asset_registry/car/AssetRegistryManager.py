@@ -1,6 +1,16 @@
 import csv
+import json
+from .AssetRecord import AssetRecord
+from typing import Iterable, Iterator, List
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
 
 class AssetRegistryManager:
+    CLUSTER_KEY='cluster'
     NAMESPACE_KEY='namespace'
     ARTIFACT_KEY='artifact'
     VERSION_KEY='version'
@@ -10,60 +20,129 @@ class AssetRegistryManager:
     CONTAINER_IMAGE_ID_KEY='digest'
     CONTAINER_VERIFIED_KEY='digest_verified'
     CONTAINER_UPDATED_KEY='updated'
+    DELTA_ADDED='added'
+    DELTA_REMOVED='removed'
+    DELTA_DIGEST_CHANGED='digest_changed'
+    DELTA_VERIFICATION_CHANGED='verification_changed'
+    PARQUET_SUPPORTED=pyarrow is not None
+    PARQUET_BATCH_SIZE=10000
 
-    def __init__(self) -> None:
+    def __init__(self, include_cluster: bool = False) -> None:
         super().__init__()
+        self._include_cluster = include_cluster
         self._assets = dict()
+        self._releases = None
 
-    def get_asset_fingerprint(self, asset: dict) -> str:
-        return f"{asset.get(AssetRegistryManager.NAMESPACE_KEY) or ''}-{asset.get(AssetRegistryManager.ARTIFACT_KEY) or ''}-{asset.get(AssetRegistryManager.VERSION_KEY) or ''}-{asset.get(AssetRegistryManager.CONTAINER_NAME_KEY) or ''}"
+    def get_asset_fingerprint(self, asset: dict or AssetRecord) -> str:
+        return asset.fingerprint if isinstance(asset, AssetRecord) else AssetRecord.get_fingerprint(asset)
 
     def load_csv(self, file_path: str) -> None:
         self._assets = dict()
+        self._releases = None
         try:
             with open(file_path, 'r') as file:
                 csvreader = csv.reader(file)
                 csv_header = next(csvreader)
                 for row in csvreader:
-                    asset = dict()
-                    for i in range(len(csv_header)):
-                        key = csv_header[i]
-                        value = None if i>=len(row) else row[i]
-                        asset[key] = value
-                    self._assets[self.get_asset_fingerprint(asset)] = asset
+                    asset = AssetRecord.from_row(csv_header, row)
+                    self._assets[asset.fingerprint] = asset
         except:
             pass
 
     def save_csv(self, file_path: str) -> None:
-        csv_header = [AssetRegistryManager.NAMESPACE_KEY,
-                         AssetRegistryManager.ARTIFACT_KEY,
-                         AssetRegistryManager.VERSION_KEY,
-                         AssetRegistryManager.CHART_KEY,
-                         AssetRegistryManager.CONTAINER_NAME_KEY,
-                         AssetRegistryManager.CONTAINER_UPDATED_KEY,
-                         AssetRegistryManager.CONTAINER_IMAGE_KEY,
-                         AssetRegistryManager.CONTAINER_IMAGE_ID_KEY,
-                         AssetRegistryManager.CONTAINER_VERIFIED_KEY]
-
-        csv_rows = list(self._assets.values())
-        csv_rows.sort(key = lambda x: self.get_asset_fingerprint(x))
-
         with open(file_path, 'w', encoding='UTF8') as file:
             csv_writer = csv.writer(file)
+            csv_header = self._get_fields()
             csv_writer.writerow(csv_header)
+            csv_writer.writerows(asset.to_row(csv_header) for asset in self)
 
-            for asset in csv_rows:
-                row = []
-                for i in range(len(csv_header)):
-                    header = csv_header[i]
-                    row.append(asset.get(header) or '')
-                csv_writer.writerow(row)
+    def _get_fields(self) -> list:
+        return AssetRecord.FIELDS if self._include_cluster else AssetRecord.CSV_FIELDS
 
-    def get_asset(self, fingerprint: str or dict) -> dict or None:
-        if type(fingerprint) == dict:
-            return self._assets.get(self.get_asset_fingerprint(fingerprint))
-        else:
+    def save_jsonl(self, file_path: str) -> None:
+        fields = self._get_fields()
+        with open(file_path, 'w', encoding='UTF8') as file:
+            for asset in self:
+                file.write(json.dumps(dict(zip(fields, [value or None for value in asset.to_row(fields)]))))
+                file.write('\n')
+
+    def save_parquet(self, file_path: str) -> None:
+        assert AssetRegistryManager.PARQUET_SUPPORTED, "parquet output requires pyarrow (pip install pyarrow)"
+        fields = self._get_fields()
+        schema = pyarrow.schema([(field, pyarrow.string()) for field in fields])
+        with pyarrow.parquet.ParquetWriter(file_path, schema) as writer:
+            batch = []
+            for asset in self:
+                batch.append(asset)
+                if len(batch) == AssetRegistryManager.PARQUET_BATCH_SIZE:
+                    writer.write_table(AssetRegistryManager._to_table(schema, fields, batch))
+                    batch = []
+            if (len(batch) > 0) or (len(self) == 0):
+                writer.write_table(AssetRegistryManager._to_table(schema, fields, batch))
+
+    @staticmethod
+    def _to_table(schema, fields: list, assets: List[AssetRecord]):
+        return pyarrow.Table.from_pydict({field: [getattr(asset, field) or None for asset in assets] for field in fields}, schema=schema)
+
+    @staticmethod
+    def diff(previous: Iterable[AssetRecord], current: Iterable[AssetRecord]) -> Iterator[tuple]:
+        previous = iter(previous)
+        current = iter(current)
+        previous_asset = next(previous, None)
+        current_asset = next(current, None)
+        while (previous_asset is not None) or (current_asset is not None):
+            if (current_asset is None) or ((previous_asset is not None) and (previous_asset.fingerprint < current_asset.fingerprint)):
+                yield AssetRegistryManager.DELTA_REMOVED, previous_asset, None
+                previous_asset = next(previous, None)
+            elif (previous_asset is None) or (current_asset.fingerprint < previous_asset.fingerprint):
+                yield AssetRegistryManager.DELTA_ADDED, None, current_asset
+                current_asset = next(current, None)
+            else:
+                if (previous_asset.digest or '') != (current_asset.digest or ''):
+                    yield AssetRegistryManager.DELTA_DIGEST_CHANGED, previous_asset, current_asset
+                elif (previous_asset.digest_verified or '') != (current_asset.digest_verified or ''):
+                    yield AssetRegistryManager.DELTA_VERIFICATION_CHANGED, previous_asset, current_asset
+                previous_asset = next(previous, None)
+                current_asset = next(current, None)
+
+    def save_delta(self, file_path: str, previous: 'AssetRegistryManager') -> dict:
+        fields = self._get_fields()
+        counts = dict.fromkeys([AssetRegistryManager.DELTA_ADDED, AssetRegistryManager.DELTA_REMOVED, AssetRegistryManager.DELTA_DIGEST_CHANGED, AssetRegistryManager.DELTA_VERIFICATION_CHANGED], 0)
+        with open(file_path, 'w', encoding='UTF8') as file:
+            for change, previous_asset, asset in AssetRegistryManager.diff(previous, self):
+                counts[change] = counts[change] + 1
+                record = {"change": change, "fingerprint": (asset or previous_asset).fingerprint}
+                record.update(zip(fields, [value or None for value in (asset or previous_asset).to_row(fields)]))
+                if (previous_asset is not None) and (asset is not None):
+                    record["previous_digest"] = previous_asset.digest or None
+                    record["previous_digest_verified"] = previous_asset.digest_verified or None
+                file.write(json.dumps(record))
+                file.write('\n')
+        return counts
+
+    def __iter__(self):
+        for fingerprint in sorted(self._assets):
+            yield self._assets[fingerprint]
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def get_asset(self, fingerprint: str or dict or AssetRecord) -> AssetRecord or None:
+        if type(fingerprint) == str:
             return self._assets.get(fingerprint)
+        else:
+            return self._assets.get(self.get_asset_fingerprint(fingerprint))
+
+    def get_release_assets(self, namespace: str, artifact: str) -> List[AssetRecord]:
+        releases = self._releases
+        if releases is None:
+            releases = dict()
+            for asset in self:
+                releases.setdefault((asset.namespace or '', asset.artifact or ''), []).append(asset)
+            self._releases = releases
+        return releases.get((namespace or '', artifact or ''), [])
 
-    def set_asset(self, asset: dict) -> None:
-        self._assets[self.get_asset_fingerprint(asset)] = asset
+    def set_asset(self, asset: dict or AssetRecord) -> None:
+        record = AssetRecord.from_dict(asset)
+        self._assets[record.fingerprint] = record
+        self._releases = None
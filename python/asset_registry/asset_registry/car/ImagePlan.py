@@ -0,0 +1,56 @@
+from dateutil import parser
+from .AssetRecord import AssetRecord
+from .AssetRegistryManager import AssetRegistryManager
+
+class ImagePlan:
+    DIGEST_LOOKUP = 'digest'
+    CREATED_LOOKUP = 'created'
+    LOOKUP_KEYS = {
+        DIGEST_LOOKUP: AssetRegistryManager.CONTAINER_VERIFIED_KEY,
+        CREATED_LOOKUP: AssetRegistryManager.CONTAINER_UPDATED_KEY
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._groups = dict()
+        self._containers = 0
+
+    def add(self, row: dict, image: str, digest: str, source_row: AssetRecord = None) -> None:
+        self._groups.setdefault((image, digest), []).append(row)
+        self._containers += 1
+
+        if (source_row != None) and (source_row.get(AssetRegistryManager.CONTAINER_IMAGE_ID_KEY) == digest):
+            row[AssetRegistryManager.CONTAINER_VERIFIED_KEY] = "Valid"
+
+        if (source_row != None) and (source_row.get(AssetRegistryManager.CONTAINER_UPDATED_KEY) is not None) and (len(source_row.get(AssetRegistryManager.CONTAINER_UPDATED_KEY)) > 0):
+            row[AssetRegistryManager.CONTAINER_UPDATED_KEY] = source_row[AssetRegistryManager.CONTAINER_UPDATED_KEY]
+
+    def _needs_lookup(self, rows: list, lookup: str) -> bool:
+        return any(row.get(ImagePlan.LOOKUP_KEYS[lookup]) is None for row in rows)
+
+    def get_lookups(self) -> list:
+        lookups = []
+        for (image, _), rows in self._groups.items():
+            for lookup in [ImagePlan.DIGEST_LOOKUP, ImagePlan.CREATED_LOOKUP]:
+                if self._needs_lookup(rows, lookup):
+                    lookups.append((lookup, image))
+        return list(dict.fromkeys(lookups))
+
+    def get_summary(self) -> dict:
+        return {
+            "containers": self._containers,
+            "images": len({image for image, _ in self._groups}),
+            "pairs": len(self._groups),
+            "lookups": len(self.get_lookups())
+        }
+
+    def resolve(self, results: dict) -> None:
+        for (image, digest), rows in self._groups.items():
+            for row in rows:
+                if row.get(AssetRegistryManager.CONTAINER_VERIFIED_KEY) is None:
+                    registry_digest = results.get((ImagePlan.DIGEST_LOOKUP, image))
+                    row[AssetRegistryManager.CONTAINER_VERIFIED_KEY] = "Valid" if (registry_digest is not None) and (registry_digest == digest) else "Invalid"
+
+                if row.get(AssetRegistryManager.CONTAINER_UPDATED_KEY) is None:
+                    created_date = results.get((ImagePlan.CREATED_LOOKUP, image))
+                    row[AssetRegistryManager.CONTAINER_UPDATED_KEY] = '' if created_date is None else str(parser.parse(created_date).date())
@@ -1 +1,3 @@
-from .AssetRegistryManager import AssetRegistryManager
\ No newline at end of file
+from .AssetRecord import AssetRecord
+from .AssetRegistryManager import AssetRegistryManager
+from .ImagePlan import ImagePlan
\ No newline at end of file
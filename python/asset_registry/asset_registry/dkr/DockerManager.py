@@ -1,26 +1,91 @@
 import docker
+import threading
 from docker.models.images import RegistryData,Image
+from .ImageMetadataCache import ImageMetadataCache
+from .RegistryClient import RegistryClient
+from .RetryPolicy import RetryPolicy
 
 class DockerManager:
-    def __init__(self) -> None:
+    def __init__(self, metadata_only: bool = True, cache: ImageMetadataCache = None, retry_policy: RetryPolicy = None) -> None:
         super().__init__()
         self._docker = docker.from_env()
-        self._retries = 5
+        self._registry = RegistryClient() if metadata_only else None
+        self._cache = cache or ImageMetadataCache()
+        self._retry_policy = retry_policy or RetryPolicy()
+        self._lookups = dict()
+        self._lookups_lock = threading.Lock()
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        return self._retry_policy
+
+    def add_registry_response_hook(self, hook) -> None:
+        if self._registry is not None:
+            self._registry.add_response_hook(hook)
+
+    def _coalesce(self, key: tuple, function) -> any:
+        with self._lookups_lock:
+            lookup = self._lookups.get(key)
+            if lookup is None:
+                lookup = {"lock": threading.Lock(), "done": False, "result": None}
+                self._lookups[key] = lookup
+
+        with lookup["lock"]:
+            if not lookup["done"]:
+                lookup["result"] = function()
+                lookup["done"] = True
+            return lookup["result"]
 
     def get_image_registry_data(self, image: str) -> RegistryData or None:
-        attempt = 1
-        while (attempt<=self._retries):
-            try:
-                return self._docker.images.get_registry_data(image)
-            except:
-                attempt = attempt+1
-        return None
+        try:
+            return self._retry_policy.call(image, self._docker.images.get_registry_data, image)
+        except Exception:
+            return None
 
     def pull_image(self, image: str) -> Image or None:
-        attempt = 1
-        while (attempt<=self._retries):
-            try:
-                return self._docker.images.pull(image)
-            except:
-                attempt = attempt+1
-        return None
+        try:
+            return self._retry_policy.call(image, self._docker.images.pull, image)
+        except Exception:
+            return None
+
+    def get_image_metadata(self, image: str) -> any:
+        if self._registry is None:
+            return None
+        try:
+            return self._retry_policy.call(image, self._registry.get_image_metadata, image)
+        except Exception:
+            return None
+
+    def _load_image_digest(self, image: str) -> str or None:
+        digest = self._cache.get_tag_digest(image)
+        if digest is None:
+            registry_data = self.get_image_registry_data(image)
+            digest = None if registry_data is None else registry_data.id
+            if digest is not None:
+                self._cache.set_tag_digest(image, digest)
+        return digest
+
+    def get_image_digest(self, image: str) -> str or None:
+        return self._coalesce(("digest", image), lambda: self._load_image_digest(image))
+
+    def _load_image_created(self, image: str) -> str or None:
+        digest = self._cache.get_tag_digest(image)
+        created = None if digest is None else self._cache.get_digest_created(digest)
+        if created is not None:
+            return created
+
+        metadata = self.get_image_metadata(image)
+        if (metadata is not None) and (metadata.created is not None):
+            if metadata.digest is not None:
+                self._cache.set_tag_digest(image, metadata.digest)
+                self._cache.set_digest_created(metadata.digest, metadata.created)
+            return metadata.created
+
+        img = self.pull_image(image)
+        created = None if img is None else img.attrs.get('Created')
+        if (created is not None) and (digest is not None):
+            self._cache.set_digest_created(digest, created)
+        return created
+
+    def get_image_created(self, image: str) -> str or None:
+        return self._coalesce(("created", image), lambda: self._load_image_created(image))
@@ -0,0 +1,35 @@
+import sqlite3
+import threading
+import time
+
+class ImageMetadataCache:
+    def __init__(self, file_path: str = ':memory:', tag_ttl: int = 86400) -> None:
+        super().__init__()
+        self._tag_ttl = tag_ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(file_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS tags (image TEXT PRIMARY KEY, digest TEXT, fetched_at REAL)")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS digests (digest TEXT PRIMARY KEY, created TEXT, fetched_at REAL)")
+
+    def get_tag_digest(self, image: str) -> str or None:
+        with self._lock:
+            row = self._connection.execute("SELECT digest FROM tags WHERE image = ? AND fetched_at >= ?", (image, time.time() - self._tag_ttl)).fetchone()
+        return None if row is None else row[0]
+
+    def set_tag_digest(self, image: str, digest: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO tags (image, digest, fetched_at) VALUES (?, ?, ?)", (image, digest, time.time()))
+
+    def get_digest_created(self, digest: str) -> str or None:
+        with self._lock:
+            row = self._connection.execute("SELECT created FROM digests WHERE digest = ?", (digest,)).fetchone()
+        return None if row is None else row[0]
+
+    def set_digest_created(self, digest: str, created: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO digests (digest, created, fetched_at) VALUES (?, ?, ?)", (digest, created, time.time()))
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
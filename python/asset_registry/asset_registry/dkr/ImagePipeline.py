@@ -0,0 +1,40 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from docker.auth import resolve_repository_name
+from typing import Callable, Dict, List, Tuple
+
+class ImagePipeline:
+    def __init__(self, workers: int = 1, registry_workers: int = 4) -> None:
+        super().__init__()
+        assert workers > 0, "workers must be greater than 0"
+        assert registry_workers > 0, "registry workers must be greater than 0"
+        self._workers = workers
+        self._registry_workers = registry_workers
+        self._registry_limits = dict()
+        self._registry_limits_lock = threading.Lock()
+
+    def _get_registry_limit(self, image: str) -> threading.Semaphore:
+        try:
+            registry, _ = resolve_repository_name(image)
+        except Exception:
+            registry = ''
+
+        with self._registry_limits_lock:
+            limit = self._registry_limits.get(registry)
+            if limit is None:
+                limit = threading.Semaphore(self._registry_workers)
+                self._registry_limits[registry] = limit
+            return limit
+
+    def _run_task(self, function: Callable, image: str) -> any:
+        with self._get_registry_limit(image):
+            return function(image)
+
+    def run(self, tasks: List[Tuple[Callable, str]]) -> Dict[Tuple[Callable, str], any]:
+        unique_tasks = list(dict.fromkeys(tasks))
+        if self._workers == 1:
+            return {task: self._run_task(*task) for task in unique_tasks}
+
+        with ThreadPoolExecutor(max_workers=self._workers) as executor:
+            futures = {task: executor.submit(self._run_task, *task) for task in unique_tasks}
+            return {task: future.result() for task, future in futures.items()}
@@ -0,0 +1,128 @@
+import re
+import requests
+from docker.auth import load_config, resolve_repository_name, INDEX_NAME
+from docker.utils import parse_repository_tag
+from dotmap import DotMap
+
+class RegistryClient:
+    DOCKER_HUB_REGISTRY = 'registry-1.docker.io'
+    MANIFEST_LIST_MEDIA_TYPES = [
+        'application/vnd.docker.distribution.manifest.list.v2+json',
+        'application/vnd.oci.image.index.v1+json'
+    ]
+    MANIFEST_MEDIA_TYPES = [
+        'application/vnd.docker.distribution.manifest.v2+json',
+        'application/vnd.oci.image.manifest.v1+json'
+    ]
+
+    def __init__(self, platform_os: str = 'linux', platform_architecture: str = 'amd64', insecure_registries: list = None, timeout: int = 30) -> None:
+        super().__init__()
+        self._platform_os = platform_os
+        self._platform_architecture = platform_architecture
+        self._insecure_registries = insecure_registries or ['localhost', '127.0.0.1']
+        self._timeout = timeout
+        self._session = requests.Session()
+        self._auth_config = load_config()
+        self._tokens = dict()
+
+    def add_response_hook(self, hook) -> None:
+        self._session.hooks['response'].append(hook)
+
+    def parse_image(self, image: str) -> tuple:
+        repository, reference = parse_repository_tag(image)
+        if '@' in image:
+            tagged_repository, _, tag = repository.rpartition(':')
+            if tagged_repository and '/' not in tag:
+                repository = tagged_repository
+
+        registry, repository = resolve_repository_name(repository)
+        if registry == INDEX_NAME:
+            registry = RegistryClient.DOCKER_HUB_REGISTRY
+            if '/' not in repository:
+                repository = f"library/{repository}"
+
+        return registry, repository, reference or 'latest'
+
+    def _get_base_url(self, registry: str) -> str:
+        host = registry.split(':')[0]
+        scheme = 'http' if (registry in self._insecure_registries) or (host in self._insecure_registries) else 'https'
+        return f"{scheme}://{registry}/v2"
+
+    def _get_credentials(self, registry: str) -> tuple or None:
+        auth_registry = INDEX_NAME if registry == RegistryClient.DOCKER_HUB_REGISTRY else registry
+        try:
+            auth = self._auth_config.resolve_authconfig(auth_registry) or {}
+        except Exception:
+            return None
+
+        username = auth.get('Username') or auth.get('username')
+        password = auth.get('Password') or auth.get('password')
+        return (username, password) if username and password else None
+
+    def _authenticate(self, registry: str, repository: str, challenge: str) -> dict:
+        credentials = self._get_credentials(registry)
+        scheme, _, params = challenge.partition(' ')
+
+        if scheme.lower() == 'basic':
+            return {} if credentials is None else {'auth': credentials}
+
+        params = dict(re.findall(r'(\w+)="([^"]*)"', params))
+        realm = params.pop('realm', None)
+        assert realm is not None, f"registry [{registry}] bearer challenge has no realm"
+        params.setdefault('scope', f"repository:{repository}:pull")
+
+        response = self._session.get(realm, params=params, auth=credentials, timeout=self._timeout)
+        response.raise_for_status()
+        token = response.json().get('token') or response.json().get('access_token')
+        return {'headers': {'Authorization': f"Bearer {token}"}}
+
+    def _get(self, registry: str, repository: str, path: str, headers: dict = None) -> requests.Response:
+        url = f"{self._get_base_url(registry)}/{repository}/{path}"
+        auth = self._tokens.get((registry, repository), {})
+        request_headers = dict(headers or {})
+        request_headers.update(auth.get('headers', {}))
+
+        response = self._session.get(url, headers=request_headers, auth=auth.get('auth'), timeout=self._timeout)
+        if response.status_code == 401 and 'WWW-Authenticate' in response.headers:
+            auth = self._authenticate(registry, repository, response.headers['WWW-Authenticate'])
+            self._tokens[(registry, repository)] = auth
+            request_headers.update(auth.get('headers', {}))
+            response = self._session.get(url, headers=request_headers, auth=auth.get('auth'), timeout=self._timeout)
+
+        response.raise_for_status()
+        return response
+
+    def _get_manifest(self, registry: str, repository: str, reference: str) -> requests.Response:
+        accept = ', '.join(RegistryClient.MANIFEST_LIST_MEDIA_TYPES + RegistryClient.MANIFEST_MEDIA_TYPES)
+        return self._get(registry, repository, f"manifests/{reference}", headers={'Accept': accept})
+
+    def _select_platform_manifest(self, manifest_list: dict) -> str or None:
+        for manifest in manifest_list.get('manifests') or []:
+            platform = manifest.get('platform') or {}
+            if (platform.get('os') == self._platform_os) and (platform.get('architecture') == self._platform_architecture):
+                return manifest.get('digest')
+        return None
+
+    def get_image_metadata(self, image: str) -> DotMap or None:
+        registry, repository, reference = self.parse_image(image)
+
+        response = self._get_manifest(registry, repository, reference)
+        digest = response.headers.get('Docker-Content-Digest')
+        manifest = response.json()
+
+        media_type = manifest.get('mediaType') or response.headers.get('Content-Type', '').split(';')[0]
+        if (media_type in RegistryClient.MANIFEST_LIST_MEDIA_TYPES) or ('manifests' in manifest):
+            platform_digest = self._select_platform_manifest(manifest)
+            if platform_digest is None:
+                return None
+            manifest = self._get_manifest(registry, repository, platform_digest).json()
+
+        config_digest = (manifest.get('config') or {}).get('digest')
+        if config_digest is None:
+            return None
+
+        image_config = self._get(registry, repository, f"blobs/{config_digest}").json()
+        return DotMap({
+            "digest": digest,
+            "created": image_config.get('created')
+        })
@@ -0,0 +1,82 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable
+
+class RetryPolicy:
+    NON_RETRYABLE_STATUS_CODES = [400, 401, 403, 404, 405, 422]
+    NON_RETRYABLE_MESSAGES = ['not found', 'manifest unknown', 'name unknown', 'unauthorized', 'denied']
+    THROTTLED_MESSAGES = ['toomanyrequests', 'too many requests', 'rate limit']
+
+    def __init__(self, max_attempts: int = 5, base_delay: float = 0.5, max_delay: float = 30.0, jitter: float = 0.5, sleep: Callable = time.sleep) -> None:
+        super().__init__()
+        assert max_attempts > 0, "max attempts must be greater than 0"
+        self._max_attempts = max_attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._jitter = jitter
+        self._sleep = sleep
+        self._stats = dict()
+        self._stats_lock = threading.Lock()
+
+    def get_status_code(self, error: Exception) -> int or None:
+        response = getattr(error, 'response', None)
+        return getattr(response, 'status_code', None)
+
+    def get_retry_after(self, error: Exception) -> float or None:
+        response = getattr(error, 'response', None)
+        retry_after = None if response is None else (getattr(response, 'headers', None) or {}).get('Retry-After')
+        if retry_after is None:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def is_retryable(self, error: Exception) -> bool:
+        message = str(error).lower()
+        if any(throttled in message for throttled in RetryPolicy.THROTTLED_MESSAGES):
+            return True
+        if self.get_status_code(error) in RetryPolicy.NON_RETRYABLE_STATUS_CODES:
+            return False
+        return not any(non_retryable in message for non_retryable in RetryPolicy.NON_RETRYABLE_MESSAGES)
+
+    def get_delay(self, attempt: int, error: Exception) -> float:
+        delay = min(self._max_delay, self._base_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(delay * (1 - self._jitter), delay)
+        retry_after = self.get_retry_after(error)
+        return delay if retry_after is None else min(self._max_delay, max(delay, retry_after))
+
+    def _record(self, key: str, attempts: int, elapsed: float, failed: bool) -> None:
+        with self._stats_lock:
+            stats = self._stats.setdefault(key, {"calls": 0, "attempts": 0, "failures": 0, "elapsed": 0.0})
+            stats["calls"] += 1
+            stats["attempts"] += attempts
+            stats["failures"] += 1 if failed else 0
+            stats["elapsed"] += elapsed
+
+    def get_stats(self, key: str = None) -> dict:
+        with self._stats_lock:
+            if key is not None:
+                return dict(self._stats.get(key) or {})
+            return {stats_key: dict(stats) for stats_key, stats in self._stats.items()}
+
+    def call(self, key: str, function: Callable, *args, **kwargs) -> any:
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                result = function(*args, **kwargs)
+                self._record(key, attempt, time.monotonic() - started, False)
+                return result
+            except Exception as e:
+                if (attempt >= self._max_attempts) or not self.is_retryable(e) or ((self.get_retry_after(e) or 0.0) > self._max_delay):
+                    self._record(key, attempt, time.monotonic() - started, True)
+                    raise
+                self._sleep(self.get_delay(attempt, e))
+                attempt = attempt + 1
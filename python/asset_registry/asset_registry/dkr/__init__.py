@@ -1 +1,5 @@
-from .DockerManager import DockerManager
\ No newline at end of file
+from .DockerManager import DockerManager
+from .ImageMetadataCache import ImageMetadataCache
+from .ImagePipeline import ImagePipeline
+from .RegistryClient import RegistryClient
+from .RetryPolicy import RetryPolicy
\ No newline at end of file
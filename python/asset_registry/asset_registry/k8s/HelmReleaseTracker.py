@@ -0,0 +1,93 @@
+import json
+import os
+from kubernetes.client.rest import ApiException
+from .K8sManager import K8sManager
+
+class HelmReleaseTracker:
+    HTTP_STATUS_GONE = 410
+
+    def __init__(self, k8: K8sManager, file_path: str, watch_timeout: int = 5) -> None:
+        super().__init__()
+        self._k8 = k8
+        self._file_path = file_path
+        self._watch_timeout = watch_timeout
+        self._state = None
+        self._changed_releases = None
+        self._changed_namespaces = set()
+
+    def load_state(self) -> None:
+        self._state = None
+        if os.path.exists(self._file_path):
+            with open(self._file_path, 'r') as file:
+                self._state = json.load(file)
+
+    def save_state(self) -> None:
+        assert self._state is not None, "release state was not synced"
+        with open(self._file_path, 'w', encoding='UTF8') as file:
+            json.dump(self._state, file)
+
+    def _full_sync(self) -> None:
+        state = {"resource_versions": dict(), "resources": dict()}
+        for kind, (resources, resource_version) in self._k8.list_all_helm_resources().items():
+            state["resources"][kind] = resources
+            state["resource_versions"][kind] = resource_version
+        state["resource_versions"]["pods"] = self._k8.get_pods_resource_version()
+
+        self._state = state
+        self._changed_releases = None
+        self._changed_namespaces = set()
+
+    def _incremental_sync(self) -> None:
+        changed_releases = set()
+        changed_namespaces = set()
+        resource_versions = dict(self._state["resource_versions"])
+
+        kinds = K8sManager.HELM_RESOURCE_KINDS + ['pods']
+        changes = dict(zip(kinds, self._k8.map(lambda kind: self._k8.watch_changes(kind, resource_versions[kind], self._watch_timeout), kinds)))
+
+        for kind in K8sManager.HELM_RESOURCE_KINDS:
+            resources = self._state["resources"][kind]
+            events, resource_versions[kind] = changes[kind]
+            for event in events:
+                previous = resources.pop(event["key"], None)
+                if previous is not None:
+                    changed_releases.add((previous["namespace"], previous["name"]))
+                if event["type"] != 'DELETED':
+                    resource = K8sManager.get_helm_resource(event["namespace"], event["labels"], event["annotations"])
+                    resources[event["key"]] = resource
+                    changed_releases.add((resource["namespace"], resource["name"]))
+
+        releases = {(resource["namespace"], resource["name"]) for kind in K8sManager.HELM_RESOURCE_KINDS for resource in self._state["resources"][kind].values()}
+        events, resource_versions["pods"] = changes["pods"]
+        for event in events:
+            pod_releases = [(event["namespace"], event["labels"].get(label)) for label in K8sManager.RELEASE_LABEL_KEYS if event["labels"].get(label)]
+            if not any(pod_release in releases for pod_release in pod_releases):
+                changed_namespaces.add(event["namespace"])
+            changed_releases.update(pod_releases)
+
+        self._state["resource_versions"] = resource_versions
+        self._changed_releases = changed_releases
+        self._changed_namespaces = changed_namespaces
+
+    def sync(self) -> list:
+        self.load_state()
+        try:
+            if self._state is None:
+                self._full_sync()
+            else:
+                self._incremental_sync()
+        except ApiException as e:
+            if e.status != HelmReleaseTracker.HTTP_STATUS_GONE:
+                raise
+            print(f"Release state is too old ({e.reason}), resyncing")
+            self._full_sync()
+
+        resources = []
+        for kind in K8sManager.HELM_RESOURCE_KINDS:
+            resources.extend(self._state["resources"][kind].values())
+        return K8sManager.merge_helm_resources(resources)
+
+    def is_release_changed(self, namespace: str, name: str) -> bool:
+        if self._changed_releases is None:
+            return True
+        return (namespace in self._changed_namespaces) or ((namespace, name) in self._changed_releases)
@@ -1,55 +1,148 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotmap import DotMap
-from kubernetes import config, client
+from kubernetes import config, client, watch
 from kubernetes.client import Configuration
 from kubernetes.client.rest import ApiException
 from kubernetes.client.models.v1_pod import V1Pod
 from kubernetes.client.models.v1_deployment import V1Deployment
 from kubernetes.client.models.v1_component_status import V1ComponentStatus
 from kubernetes.client.models.v1_component_status_list import V1ComponentStatusList
-from typing import List
+from typing import Callable, List
+from .RateLimiter import RateLimiter
 
 class K8sManager:
+    HELM_LABEL_SELECTOR = 'app.kubernetes.io/managed-by=Helm'
+    HELM_RESOURCE_KINDS = ['deployments', 'statefulsets', 'services', 'configmaps', 'secrets', 'cronjobs', 'jobs']
+    RELEASE_LABEL_KEYS = ['app.kubernetes.io/name', 'app.kubernetes.io/instance', 'release', 'app']
+    HELM_RESOURCE_PATHS = {
+        'deployments': '/apis/apps/v1/deployments',
+        'statefulsets': '/apis/apps/v1/statefulsets',
+        'services': '/api/v1/services',
+        'configmaps': '/api/v1/configmaps',
+        'secrets': '/api/v1/secrets',
+        'cronjobs': '/apis/batch/v1/cronjobs',
+        'jobs': '/apis/batch/v1/jobs'
+    }
+    METADATA_ACCEPT = 'application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,application/json'
 
-    def __init__(self) -> None:
+    def __init__(self, snapshot: bool = False, page_size: int = 500, context: str = None, concurrency: int = 1, qps: float = None, burst: int = None) -> None:
         super().__init__()
-        config.load_kube_config()
-        try:
-            c = Configuration().get_default_copy()
-        except AttributeError:
-            c = Configuration()
-            c.assert_hostname = False
-        Configuration.set_default(c)
-        self._core_v1 = client.CoreV1Api()
-        self._apps_v1 = client.AppsV1Api()
-        self._batch_v1 = client.BatchV1Api()
+        self.context = context
+        if context is None:
+            config.load_kube_config()
+            try:
+                c = Configuration().get_default_copy()
+            except AttributeError:
+                c = Configuration()
+                c.assert_hostname = False
+            Configuration.set_default(c)
+            api_client = None
+        else:
+            api_client = config.new_client_from_config(context=context)
+        self._core_v1 = client.CoreV1Api(api_client)
+        self._apps_v1 = client.AppsV1Api(api_client)
+        self._batch_v1 = client.BatchV1Api(api_client)
+        self._api_client = self._core_v1.api_client
+        self._snapshot = snapshot
+        self._snapshot_lock = threading.Lock()
+        self._page_size = page_size
+        assert concurrency > 0, "concurrency must be greater than 0"
+        self._concurrency = concurrency
+        self._rate_limiter = None if not qps else RateLimiter(qps, burst or max(1, int(qps)))
+        self._pod_index = None
+        self._deployment_index = None
+
+    def get_apis(self) -> list:
+        return [self._core_v1, self._apps_v1, self._batch_v1]
+
+    def _call(self, function: Callable, *args, **kwargs) -> any:
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        return function(*args, **kwargs)
+
+    def map(self, function: Callable, items: list) -> list:
+        items = list(items)
+        if (self._concurrency == 1) or (len(items) < 2):
+            return [function(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(self._concurrency, len(items))) as executor:
+            return list(executor.map(function, items))
+
+    @staticmethod
+    def list_contexts() -> List[str]:
+        contexts, _ = config.list_kube_config_contexts()
+        return [context['name'] for context in contexts]
+
+    def _list_all(self, list_function, **kwargs) -> list:
+        items = []
+        _continue = None
+        while True:
+            resourcelist = self._call(list_function, limit=self._page_size, _continue=_continue, **kwargs)
+            items.extend(resourcelist.items)
+            _continue = resourcelist.metadata._continue
+            if not _continue:
+                return items
+
+    def _index_resources(self, resources: list) -> dict:
+        index = dict()
+        for resource in resources:
+            namespace = resource.metadata.namespace
+            index.setdefault((namespace, None, None), []).append(resource)
+            for label, value in (resource.metadata.labels or {}).items():
+                index.setdefault((namespace, label, value), []).append(resource)
+        return index
+
+    def load_snapshot(self) -> None:
+        pods, deployments = self.map(self._list_all, [self._core_v1.list_pod_for_all_namespaces, self._apps_v1.list_deployment_for_all_namespaces])
+        self._pod_index = self._index_resources(pods)
+        self._deployment_index = self._index_resources(deployments)
 
+    def _use_snapshot(self) -> bool:
+        if self._snapshot and (self._pod_index is None or self._deployment_index is None):
+            with self._snapshot_lock:
+                if self._pod_index is None or self._deployment_index is None:
+                    self.load_snapshot()
+        return self._snapshot
+
+    def _find_namespaced_deployments(self, namespace: str, label: str, value: str) -> List[V1Deployment]:
+        if not self._use_snapshot():
+            return self._call(self._apps_v1.list_namespaced_deployment, namespace, label_selector=f"{label}={value}").items
+        return self._deployment_index.get((namespace, label, value), [])
+
+    def _find_namespaced_pods(self, namespace: str, label: str, value: str) -> List[V1Pod]:
+        if not self._use_snapshot():
+            return self._call(self._core_v1.list_namespaced_pod, namespace, label_selector=f"{label}={value}").items
+        return self._pod_index.get((namespace, label, value), [])
+
+    def _find_selector_pods(self, namespace: str, match_labels: dict) -> List[V1Pod]:
+        if not self._use_snapshot():
+            labels = ",".join([f"{selectorlabel}={selectorvalue}" for selectorlabel, selectorvalue in match_labels.items()])
+            return self._call(self._core_v1.list_namespaced_pod, namespace, label_selector=labels).items
+
+        candidates = [self._pod_index.get((namespace, label, value), []) for label, value in match_labels.items()]
+        if len(candidates) == 0:
+            return self._pod_index.get((namespace, None, None), [])
+        candidates.sort(key=len)
+        return [pod for pod in candidates[0] if all((pod.metadata.labels or {}).get(label) == value for label, value in match_labels.items())]
 
     def find_chart_deployments(self, release_name: str, namespace: str) -> List[V1Deployment]:
-        kubernetes_deployments = [
-            self._apps_v1.list_namespaced_deployment(namespace, label_selector='app.kubernetes.io/name={}'.format(release_name)),
-            self._apps_v1.list_namespaced_deployment(namespace, label_selector='app.kubernetes.io/instance={}'.format(release_name)),
-            self._apps_v1.list_namespaced_deployment(namespace, label_selector='release={}'.format(release_name)),
-            self._apps_v1.list_namespaced_deployment(namespace, label_selector='app={}'.format(release_name))
-        ]
+        kubernetes_deployments = [self._find_namespaced_deployments(namespace, label, release_name) for label in K8sManager.RELEASE_LABEL_KEYS]
         deployments = dict()
 
         for deploymentlist in kubernetes_deployments:
-            for deployment in deploymentlist.items:
+            for deployment in deploymentlist:
                 deployments[f"{deployment.metadata.namespace}-{deployment.metadata.name}"] = deployment
 
         return list(deployments.values())
 
     def find_chart_pods(self, release_name: str, namespace: str) -> List[V1Pod]:
-        kubernetes_pods = [
-            self._core_v1.list_namespaced_pod(namespace, label_selector='app.kubernetes.io/name={}'.format(release_name)),
-            self._core_v1.list_namespaced_pod(namespace, label_selector='app.kubernetes.io/instance={}'.format(release_name)),
-            self._core_v1.list_namespaced_pod(namespace, label_selector='release={}'.format(release_name)),
-            self._core_v1.list_namespaced_pod(namespace, label_selector='app={}'.format(release_name))
-        ]
+        kubernetes_pods = [self._find_namespaced_pods(namespace, label, release_name) for label in K8sManager.RELEASE_LABEL_KEYS]
         pods = dict()
 
         for podlist in kubernetes_pods:
-            for pod in podlist.items:
+            for pod in podlist:
                 pods[f"{pod.metadata.namespace}-{pod.metadata.name}"] = pod
 
         return list(pods.values())
@@ -59,58 +152,130 @@ class K8sManager:
 
         deployments = self.find_chart_deployments(release_name, namespace)
         for deployment in deployments:
-            labels = ""
-            for selectorlabel, selectorvalue in deployment.spec.selector.match_labels.items():
-                if (len(labels)>0):
-                    labels += ","
-                labels += f"{selectorlabel}={selectorvalue}"
-            deployment_pods = self._core_v1.list_namespaced_pod(namespace, label_selector=labels),
-
-            for podlist in deployment_pods:
-                for pod in podlist.items:
-                    pods[f"{pod.metadata.namespace}-{pod.metadata.name}"] = pod
+            for pod in self._find_selector_pods(namespace, deployment.spec.selector.match_labels):
+                pods[f"{pod.metadata.namespace}-{pod.metadata.name}"] = pod
 
         return list(pods.values())
 
-    def get_all_helm_deployments(self):
-        helm_label_selector = 'app.kubernetes.io/managed-by=Helm'
+    def _get_helm_list_function(self, kind: str):
+        return {
+            'deployments': self._apps_v1.list_deployment_for_all_namespaces,
+            'statefulsets': self._apps_v1.list_stateful_set_for_all_namespaces,
+            'services': self._core_v1.list_service_for_all_namespaces,
+            'configmaps': self._core_v1.list_config_map_for_all_namespaces,
+            'secrets': self._core_v1.list_secret_for_all_namespaces,
+            'cronjobs': self._batch_v1.list_cron_job_for_all_namespaces,
+            'jobs': self._batch_v1.list_job_for_all_namespaces
+        }[kind]
+
+    @staticmethod
+    def get_helm_resource(namespace: str, labels: dict, annotations: dict) -> dict:
+        labels = labels or {}
+        annotations = annotations or {}
+        chart = labels.get('chart') or labels.get('helm.sh/chart')
+        release = annotations.get('meta.helm.sh/release-name')
+        instance = labels.get('app.kubernetes.io/instance')
+        version = labels.get('app.kubernetes.io/version')
+        revision = annotations.get('deployment.kubernetes.io/revision')
+
+        return {
+                "name": instance or release or None,
+                "chart": chart or None,
+                "version": version or None,
+                "namespace": namespace or None,
+                "revision": revision or None
+            }
+
+    @staticmethod
+    def merge_helm_resources(resources) -> list:
         helm_deployments = dict()
 
-        kubernetes_resources = [
-            self._apps_v1.list_deployment_for_all_namespaces(label_selector=helm_label_selector),
-            self._apps_v1.list_stateful_set_for_all_namespaces(label_selector=helm_label_selector),
-            self._core_v1.list_service_for_all_namespaces(label_selector=helm_label_selector),
-            self._core_v1.list_config_map_for_all_namespaces(label_selector=helm_label_selector),
-            self._core_v1.list_secret_for_all_namespaces(label_selector=helm_label_selector),
-            self._batch_v1.list_cron_job_for_all_namespaces(label_selector=helm_label_selector),
-            self._batch_v1.list_job_for_all_namespaces(label_selector=helm_label_selector)
-        ]
-
-        for resourcelist in kubernetes_resources:
-            for resource in resourcelist.items:
-                chart = resource.metadata.labels.get('chart') or resource.metadata.labels.get('helm.sh/chart')
-                release = resource.metadata.annotations.get('meta.helm.sh/release-name')
-                instance = resource.metadata.labels.get('app.kubernetes.io/instance')
-                version = resource.metadata.labels.get('app.kubernetes.io/version')
-                revision = resource.metadata.annotations.get('deployment.kubernetes.io/revision')
-                namespace = resource.metadata.namespace
-
-                deployment = DotMap({
-                        "name": instance or release or None,
-                        "chart": chart or None,
-                        "version": version or None,
-                        "namespace": namespace or None,
-                        "revision": revision or None
-                    })
-
-                key = f"{deployment['namespace']}-{deployment['name']}"
-                cached_deployment = helm_deployments.get(key)
-
-                if cached_deployment == None:
-                    helm_deployments[key] = deployment
-                else:
-                    for key, value in cached_deployment.items():
-                        if (cached_deployment[key] == None) and (deployment[key] != None):
-                            cached_deployment[key] = deployment[key]
+        for resource in resources:
+            deployment = DotMap(resource)
+
+            key = f"{deployment['namespace']}-{deployment['name']}"
+            cached_deployment = helm_deployments.get(key)
+
+            if cached_deployment == None:
+                helm_deployments[key] = deployment
+            else:
+                for key, value in cached_deployment.items():
+                    if (cached_deployment[key] == None) and (deployment[key] != None):
+                        cached_deployment[key] = deployment[key]
 
         return list(helm_deployments.values())
+
+    def list_resource_metadata(self, kind: str, label_selector: str = None, _continue: str = None) -> dict:
+        query_params = [('limit', self._page_size)]
+        if label_selector is not None:
+            query_params.append(('labelSelector', label_selector))
+        if _continue:
+            query_params.append(('continue', _continue))
+
+        response = self._call(self._api_client.call_api, K8sManager.HELM_RESOURCE_PATHS[kind], 'GET',
+            query_params=query_params,
+            header_params={'Accept': K8sManager.METADATA_ACCEPT},
+            auth_settings=['BearerToken'],
+            _return_http_data_only=True,
+            _preload_content=False)
+        try:
+            return json.loads(response.data)
+        finally:
+            response.release_conn()
+
+    def _list_helm_resource_pages(self, kind: str):
+        _continue = None
+        while True:
+            resourcelist = self.list_resource_metadata(kind, K8sManager.HELM_LABEL_SELECTOR, _continue)
+            resources = dict()
+            for resource in resourcelist.get('items') or []:
+                metadata = resource.get('metadata') or {}
+                resources[f"{metadata.get('namespace')}/{metadata.get('name')}"] = K8sManager.get_helm_resource(metadata.get('namespace'), metadata.get('labels'), metadata.get('annotations'))
+            yield resources, (resourcelist.get('metadata') or {}).get('resourceVersion')
+
+            _continue = (resourcelist.get('metadata') or {}).get('continue')
+            if not _continue:
+                return
+
+    def list_helm_resources(self, kind: str) -> tuple:
+        resources = dict()
+        resource_version = None
+        for page_resources, resource_version in self._list_helm_resource_pages(kind):
+            resources.update(page_resources)
+        return resources, resource_version
+
+    def list_all_helm_resources(self) -> dict:
+        return dict(zip(K8sManager.HELM_RESOURCE_KINDS, self.map(self.list_helm_resources, K8sManager.HELM_RESOURCE_KINDS)))
+
+    def get_pods_resource_version(self) -> str:
+        return self._call(self._core_v1.list_pod_for_all_namespaces, limit=1).metadata.resource_version
+
+    def watch_changes(self, kind: str, resource_version: str, timeout_seconds: int) -> tuple:
+        list_function = self._core_v1.list_pod_for_all_namespaces if kind == 'pods' else self._get_helm_list_function(kind)
+        kwargs = dict() if kind == 'pods' else {"label_selector": K8sManager.HELM_LABEL_SELECTOR}
+        events = []
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire()
+        resource_watch = watch.Watch()
+        for event in resource_watch.stream(list_function, resource_version=resource_version, timeout_seconds=timeout_seconds, allow_watch_bookmarks=True, **kwargs):
+            metadata = event['raw_object'].get('metadata') or {}
+            resource_version = metadata.get('resourceVersion') or resource_version
+            if event['type'] != 'BOOKMARK':
+                events.append({
+                    "type": event['type'],
+                    "key": f"{metadata.get('namespace')}/{metadata.get('name')}",
+                    "namespace": metadata.get('namespace'),
+                    "labels": metadata.get('labels') or {},
+                    "annotations": metadata.get('annotations') or {}
+                })
+
+        return events, resource_version
+
+    def get_all_helm_deployments(self):
+        if self._concurrency > 1:
+            resources = (resource for kind_resources, _ in self.list_all_helm_resources().values() for resource in kind_resources.values())
+        else:
+            resources = (resource for kind in K8sManager.HELM_RESOURCE_KINDS for page_resources, _ in self._list_helm_resource_pages(kind) for resource in page_resources.values())
+
+        return K8sManager.merge_helm_resources(resources)
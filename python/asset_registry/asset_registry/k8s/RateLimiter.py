@@ -0,0 +1,28 @@
+import threading
+import time
+from typing import Callable
+
+class RateLimiter:
+    def __init__(self, qps: float, burst: int = 1, clock: Callable = time.monotonic, sleep: Callable = time.sleep) -> None:
+        super().__init__()
+        assert qps > 0, "qps must be greater than 0"
+        assert burst > 0, "burst must be greater than 0"
+        self._qps = qps
+        self._burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(float(self._burst), self._tokens + (now - self._updated) * self._qps)
+            self._updated = now
+            self._tokens = self._tokens - 1
+            delay = 0.0 if self._tokens >= 0 else -self._tokens / self._qps
+
+        if delay > 0:
+            self._sleep(delay)
+        return delay
@@ -1 +1,3 @@
-from .K8sManager import K8sManager
\ No newline at end of file
+from .K8sManager import K8sManager
+from .HelmReleaseTracker import HelmReleaseTracker
+from .RateLimiter import RateLimiter
\ No newline at end of file
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable
+
+class RunProfiler:
+    def __init__(self, enabled: bool = True) -> None:
+        super().__init__()
+        self.enabled = enabled
+        self._started = time.monotonic()
+        self._phases = dict()
+        self._counters = dict()
+        self._lock = threading.Lock()
+
+    def _record(self, name: str, elapsed: float) -> None:
+        with self._lock:
+            phase = self._phases.setdefault(name, {"calls": 0, "seconds": 0.0})
+            phase["calls"] += 1
+            phase["seconds"] += elapsed
+
+    def count(self, name: str, value: float = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record(name, time.monotonic() - started)
+
+    def wrap(self, name: str, function: Callable, hit_test: Callable = None) -> Callable:
+        def profiled(*args, **kwargs):
+            with self.phase(name):
+                result = function(*args, **kwargs)
+            if hit_test is not None:
+                self.count(f"{name}.hits" if hit_test(result) else f"{name}.misses")
+            return result
+        return profiled
+
+    def instrument(self, target: any, names: list, prefix: str, hit_test: Callable = None) -> None:
+        if not self.enabled:
+            return
+        for name in names:
+            setattr(target, name, self.wrap(f"{prefix}.{name}", getattr(target, name), hit_test))
+
+    def instrument_api(self, api: any, prefix: str) -> None:
+        self.instrument(api, [name for name in dir(api) if name.startswith('list_') and not name.endswith('_with_http_info')], prefix)
+
+    def instrument_bytes(self, target: any, name: str, counter: str, get_size: Callable) -> None:
+        if not self.enabled:
+            return
+        function = getattr(target, name)
+        def measured(*args, **kwargs):
+            result = function(*args, **kwargs)
+            self.count(counter, get_size(result) or 0)
+            return result
+        setattr(target, name, measured)
+
+    def get_report(self) -> dict:
+        with self._lock:
+            return {
+                "seconds": time.monotonic() - self._started,
+                "phases": {name: dict(phase) for name, phase in sorted(self._phases.items())},
+                "counters": dict(sorted(self._counters.items()))
+            }
+
+    def print_report(self) -> None:
+        report = self.get_report()
+        print(f"Run time: {report['seconds']:.2f}s")
+        for name, phase in report["phases"].items():
+            print(f" - {name}: {phase['calls']} calls, {phase['seconds']:.2f}s")
+        for name, value in report["counters"].items():
+            print(f" - {name}: {value}")
+
+    def save_json(self, file_path: str) -> None:
+        with open(file_path, 'w', encoding='UTF8') as file:
+            json.dump(self.get_report(), file, indent=2)
+
+    def save_prometheus(self, file_path: str) -> None:
+        report = self.get_report()
+        lines = [
+            "# TYPE asset_registry_run_seconds gauge",
+            f"asset_registry_run_seconds {report['seconds']}",
+            "# TYPE asset_registry_phase_calls gauge"
+        ]
+        lines.extend([f'asset_registry_phase_calls{{phase="{name}"}} {phase["calls"]}' for name, phase in report["phases"].items()])
+        lines.append("# TYPE asset_registry_phase_seconds gauge")
+        lines.extend([f'asset_registry_phase_seconds{{phase="{name}"}} {phase["seconds"]}' for name, phase in report["phases"].items()])
+        lines.append("# TYPE asset_registry_counter gauge")
+        lines.extend([f'asset_registry_counter{{name="{name}"}} {value}' for name, value in report["counters"].items()])
+
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, 'w', encoding='UTF8') as file:
+            file.write("\n".join(lines) + "\n")
+        os.replace(temp_path, file_path)
@@ -0,0 +1 @@
+from .RunProfiler import RunProfiler
\ No newline at end of file
@@ -0,0 +1,4 @@
+"""benchmark.__main__: executed when the benchmark package is run as a module."""
+
+from benchmark.benchmark import main
+main()
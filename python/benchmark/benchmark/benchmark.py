@@ -0,0 +1,325 @@
+"""benchmark.benchmark: provides entry point main()."""
+
+__version__ = "1.0.0"
+
+import argparse
+import contextlib
+import csv
+import glob
+import httpx
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import yaml
+from collections import namedtuple
+from unittest import mock
+from .fakes.FaultInjector import FaultInjector
+from .fakes.FakeCoreV1Api import FakeCoreV1Api
+from .fakes.FakeAppsV1Api import FakeAppsV1Api
+from .fakes.FakeBatchV1Api import FakeBatchV1Api
+from .fakes.FakeDockerClient import FakeDockerClient
+from .fakes.FakeRegistryClient import FakeRegistryClient
+from .fakes.FakeSchemaRegistry import FakeSchemaRegistry
+from .fleet.FleetGenerator import FleetGenerator
+from .fleet.SchemaFleetGenerator import SchemaFleetGenerator
+
+Scenario = namedtuple("Scenario", [
+        'name',
+        'tool',
+        'argv',
+        'runs',
+        'mutate',
+        'overrides'
+    ], defaults=[1, 0.0, {}])
+
+ScenarioResult = namedtuple("ScenarioResult", [
+        'scenario',
+        'run',
+        'error',
+        'elapsed',
+        'cpu',
+        'peak_memory',
+        'output',
+        'calls',
+        'failures'
+    ])
+
+SOURCE_SCHEMA = 'http://source.bench.local/apis/ccompat/v6/'
+DEST_SCHEMA = 'http://dest.bench.local/apis/ccompat/v6/'
+
+SCENARIOS = [
+    Scenario('asset-registry', 'asset_registry', ['--csv', '{tmp}/assets.csv']),
+    Scenario('asset-registry-concurrent', 'asset_registry', ['--csv', '{tmp}/assets.csv', '--workers', '8', '--k8s-concurrency', '8']),
+    Scenario('asset-registry-snapshot', 'asset_registry', ['--csv', '{tmp}/assets.csv', '--snapshot', '--workers', '8']),
+    Scenario('asset-registry-pull', 'asset_registry', ['--csv', '{tmp}/assets.csv', '--snapshot', '--workers', '8', '--pull']),
+    Scenario('asset-registry-warm', 'asset_registry', ['--csv', '{tmp}/assets.csv', '--snapshot', '--workers', '8', '--cache', '{tmp}/images.db'], runs=2),
+    Scenario('asset-registry-incremental', 'asset_registry', ['--csv', '{tmp}/assets.csv', '--snapshot', '--workers', '8', '--cache', '{tmp}/images.db', '--state', '{tmp}/state.json', '--watch-timeout', '1'], runs=2, mutate=0.05),
+    Scenario('asset-registry-incremental-restart', 'asset_registry', ['--csv', '{tmp}/assets.csv', '--snapshot', '--workers', '8', '--state', '{tmp}/state.json', '--watch-timeout', '1'], runs=2, overrides={"restart": 0.1, "full_scan_check": True}),
+    Scenario('asset-registry-flaky', 'asset_registry', ['--csv', '{tmp}/assets.csv', '--snapshot', '--workers', '8'], overrides={"registry_failure_rate": 0.05}),
+    Scenario('asset-registry-clusters', 'asset_registry', ['--csv', '{tmp}/assets.csv', '--snapshot', '--workers', '8', '--contexts', 'all']),
+    Scenario('asset-registry-delta', 'asset_registry', ['--csv', '{tmp}/assets.csv', '--snapshot', '--workers', '8', '--cache', '{tmp}/images.db', '--jsonl', '{tmp}/assets.jsonl', '--delta', '{tmp}/delta.jsonl'], runs=2, mutate=0.05),
+    Scenario('asset-registry-stale-verdicts', 'asset_registry', ['--csv', '{tmp}/assets.csv', '--snapshot', '--workers', '8'], runs=2, overrides={"stale_verdicts": 15}),
+    Scenario('apcrg-cp-batch', 'apcrg', ['cp-batch', '--source-schema', SOURCE_SCHEMA, '--dest-schema', DEST_SCHEMA, '--file', '{tmp}/batch.yaml']),
+    Scenario('apcrg-cp-batch-parallel', 'apcrg', ['cp-batch', '--source-schema', SOURCE_SCHEMA, '--dest-schema', DEST_SCHEMA, '--file', '{tmp}/batch.yaml', '--parallelism', '8', '--cache-dir', '{tmp}/schemas'], runs=2),
+    Scenario('apcrg-mirror', 'apcrg', ['mirror', '--source-schema', SOURCE_SCHEMA, '--dest-schema', DEST_SCHEMA, '--parallelism', '8'], runs=2),
+    Scenario('apcrg-mirror-no-bulk', 'apcrg', ['mirror', '--source-schema', SOURCE_SCHEMA, '--dest-schema', DEST_SCHEMA, '--parallelism', '8'], overrides={"bulk": False})
+]
+
+def parse_args():
+    argparser = argparse.ArgumentParser(description='Benchmark asset_registry and apcrg against in-process fake clusters and registries')
+    argparser.add_argument('--scenario', action='append', choices=[scenario.name for scenario in SCENARIOS], help='Scenario to run, may be repeated. default: all')
+    argparser.add_argument('--namespaces', type=int, default=20, help='Namespaces per cluster. default: 20')
+    argparser.add_argument('--releases', type=int, default=25, help='Helm releases per namespace. default: 25')
+    argparser.add_argument('--containers', type=int, default=2, help='Containers per pod. default: 2')
+    argparser.add_argument('--replicas', type=int, default=2, help='Pods per release. default: 2')
+    argparser.add_argument('--images', type=int, default=400, help='Size of the image pool releases pick from. default: 400')
+    argparser.add_argument('--clusters', type=int, default=3, help='Kubeconfig contexts in multi-cluster scenarios. default: 3')
+    argparser.add_argument('--subjects', type=int, default=200, help='Subjects in the source schema registry. default: 200')
+    argparser.add_argument('--versions', type=int, default=3, help='Versions per subject. default: 3')
+    argparser.add_argument('--k8s-latency', type=float, default=0.0, help='Seconds added to every Kubernetes API call. default: 0')
+    argparser.add_argument('--registry-latency', type=float, default=0.0, help='Seconds added to every image registry and docker call. default: 0')
+    argparser.add_argument('--schema-latency', type=float, default=0.0, help='Seconds added to every schema registry request. default: 0')
+    argparser.add_argument('--registry-failure-rate', type=float, default=0.0, help='Fraction of image registry and docker calls failing with a retryable error. default: 0')
+    argparser.add_argument('--schema-failure-rate', type=float, default=0.0, help='Fraction of schema registry requests answered with 503. default: 0')
+    argparser.add_argument('--seed', type=int, default=0, help='Seed for fleet generation and failure injection. default: 0')
+    argparser.add_argument('--no-memory', action='store_true', help='Skip peak memory tracing, which slows the measured runs down')
+    argparser.add_argument('--verbose', action='store_true', help='Show the output of the benchmarked commands')
+    argparser.add_argument('--json', required=False, help='Write the results to this JSON file')
+    return argparser.parse_args()
+
+def get_argv(scenario: Scenario, tmp: str) -> list:
+    return [arg.replace('{tmp}', tmp) for arg in scenario.argv]
+
+def count_csv_rows(tmp: str) -> int:
+    rows = 0
+    for file_path in glob.glob(os.path.join(tmp, '*.csv')):
+        with open(file_path, 'r') as file:
+            rows += max(0, sum(1 for _ in file) - 1)
+    return rows
+
+def get_row_key(row: dict) -> tuple:
+    return tuple(row.get(field) or '' for field in ['cluster', 'namespace', 'artifact', 'version', 'container'])
+
+def seed_stale_verdicts(tmp: str, count: int) -> set:
+    seeded = set()
+    for file_path in glob.glob(os.path.join(tmp, '*.csv')):
+        with open(file_path, 'r') as file:
+            rows = list(csv.DictReader(file))
+        if len(rows) == 0:
+            continue
+        pairs = dict()
+        for row in rows:
+            if row["digest"]:
+                pairs.setdefault((row["image"], row["digest"]), []).append(row)
+        pair_rows = max(pairs.values(), key=len)
+        pair_rows[0]["digest_verified"] = "Invalid"
+        for row in [pair_rows[0]] + pair_rows[2 * count + 1:]:
+            row["updated"] = "1999-01-01"
+        for row in pair_rows[1:count + 1]:
+            row["digest"] = "sha256:dead"
+            seeded.add(get_row_key(row))
+        removed = pair_rows[count + 1:2 * count + 1]
+        seeded.update(get_row_key(row) for row in removed)
+        with open(file_path, 'w', encoding='UTF8') as file:
+            csv_writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            csv_writer.writeheader()
+            csv_writer.writerows(row for row in rows if not any(row is removed_row for removed_row in removed))
+    return seeded
+
+def count_wrong_rows(tmp: str, fleets: list, keys: set) -> int:
+    wrong = 0
+    for file_path in glob.glob(os.path.join(tmp, '*.csv')):
+        with open(file_path, 'r') as file:
+            for row in csv.DictReader(file):
+                if get_row_key(row) not in keys:
+                    continue
+                metadata = next((fleet.get_image_metadata(row["image"]) for fleet in fleets if fleet.get_image_metadata(row["image"])), None)
+                expected = "Valid" if (metadata is not None) and (metadata["digest"] == row["digest"]) else "Invalid"
+                expected_updated = '' if metadata is None else metadata["created"][:10]
+                wrong += int((row["digest_verified"] != expected) or (row["updated"] != expected_updated))
+    return wrong
+
+def check_full_scan(tmp: str, reference: str, run_main, extra_argv: list) -> str or None:
+    for file_path in glob.glob(os.path.join(tmp, '*.csv')):
+        reference_path = os.path.join(reference, os.path.basename(file_path))
+        error = run_main(['--csv', reference_path] + [arg for args in extra_argv for arg in args])
+        if error is not None:
+            return f"full scan failed: {error}"
+        with open(file_path, 'r') as file, open(reference_path, 'r') as reference_file:
+            rows, reference_rows = [{tuple((field, value) for field, value in row.items() if field != 'digest_verified') for row in csv.DictReader(csv_file)} for csv_file in [file, reference_file]]
+        if rows != reference_rows:
+            return f"{len(rows ^ reference_rows)} rows differ from a full scan"
+    return None
+
+def measure(function, trace_memory: bool) -> tuple:
+    error = None
+    if trace_memory:
+        tracemalloc.start()
+    started, cpu_started = time.perf_counter(), time.process_time()
+    try:
+        function()
+    except SystemExit as e:
+        error = None if not e.code else f"exit code {e.code}"
+    except Exception as e:
+        error = f"{type(e).__name__}: {str(e)}"
+    elapsed, cpu = time.perf_counter() - started, time.process_time() - cpu_started
+    peak_memory = None
+    if trace_memory:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return error, elapsed, cpu, peak_memory
+
+def pop_counts(injectors: list) -> tuple:
+    calls = dict()
+    failures = dict()
+    for injector in injectors:
+        injector_calls, injector_failures = injector.pop_counts()
+        calls.update(injector_calls)
+        failures.update(injector_failures)
+    return calls, failures
+
+def run_asset_registry(scenario: Scenario, settings: dict, tmp: str, verbose: bool, trace_memory: bool) -> list:
+    from asset_registry import asset_registry
+
+    contexts = [f"cluster-{i}" for i in range(settings["clusters"] if '--contexts' in scenario.argv else 1)]
+    fleets = {context: FleetGenerator(settings["namespaces"], settings["releases"], settings["containers"], settings["replicas"], settings["images"], seed=settings["seed"] + i) for i, context in enumerate(contexts)}
+    fleets[None] = fleets[contexts[0]]
+    k8s_injector = FaultInjector(settings["k8s_latency"], seed=settings["seed"])
+    docker_injector = FaultInjector(settings["registry_latency"], settings["registry_failure_rate"], seed=settings["seed"])
+    registry_injector = FaultInjector(settings["registry_latency"], settings["registry_failure_rate"], seed=settings["seed"] + 1)
+    registry_fleets = [fleets[context] for context in contexts]
+
+    def run_main(argv: list, trace_memory: bool) -> tuple:
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(mock.patch.object(sys, 'argv', [scenario.tool] + argv))
+            stack.enter_context(mock.patch('kubernetes.config.load_kube_config'))
+            stack.enter_context(mock.patch('kubernetes.config.new_client_from_config', side_effect=lambda context=None, **kwargs: context))
+            stack.enter_context(mock.patch('kubernetes.config.list_kube_config_contexts', return_value=([{"name": context} for context in contexts], {"name": contexts[0]})))
+            stack.enter_context(mock.patch('kubernetes.client.CoreV1Api', side_effect=lambda api_client=None: FakeCoreV1Api(fleets[api_client], k8s_injector)))
+            stack.enter_context(mock.patch('kubernetes.client.AppsV1Api', side_effect=lambda api_client=None: FakeAppsV1Api(fleets[api_client], k8s_injector)))
+            stack.enter_context(mock.patch('kubernetes.client.BatchV1Api', side_effect=lambda api_client=None: FakeBatchV1Api(fleets[api_client], k8s_injector)))
+            stack.enter_context(mock.patch('docker.from_env', side_effect=lambda: FakeDockerClient(registry_fleets, docker_injector)))
+            stack.enter_context(mock.patch('asset_registry.dkr.DockerManager.RegistryClient', side_effect=lambda: FakeRegistryClient(registry_fleets, registry_injector)))
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+            return measure(asset_registry.main, trace_memory)
+
+    results = []
+    seeded = set()
+    reference = os.path.join(tmp, 'reference')
+    os.makedirs(reference, exist_ok=True)
+    for run in range(scenario.runs):
+        if (run > 0) and (scenario.mutate > 0):
+            for context in contexts:
+                fleets[context].mutate(scenario.mutate)
+        if (run > 0) and settings.get("restart"):
+            for context in contexts:
+                fleets[context].restart(settings["restart"])
+        if (run > 0) and settings.get("stale_verdicts"):
+            seeded = seed_stale_verdicts(tmp, settings["stale_verdicts"])
+        if settings.get("full_scan_check"):
+            for file_path in glob.glob(os.path.join(tmp, '*.csv')):
+                shutil.copy(file_path, reference)
+
+        error, elapsed, cpu, peak_memory = run_main(get_argv(scenario, tmp), trace_memory)
+        calls, failures = pop_counts([k8s_injector, docker_injector, registry_injector])
+
+        if (error is None) and (len(seeded) > 0):
+            wrong_rows = count_wrong_rows(tmp, registry_fleets, seeded)
+            error = None if wrong_rows == 0 else f"{wrong_rows} rows disagree with the registry digest or created date"
+        if (error is None) and settings.get("full_scan_check"):
+            error = check_full_scan(tmp, reference, lambda argv: run_main(argv, False)[0], [scenario.argv[i:i + 2] for i in range(len(scenario.argv)) if scenario.argv[i] == '--contexts'])
+            pop_counts([k8s_injector, docker_injector, registry_injector])
+        results.append(ScenarioResult(scenario.name, run + 1, error, elapsed, cpu, peak_memory, count_csv_rows(tmp), calls, failures))
+    return results
+
+def run_apcrg(scenario: Scenario, settings: dict, tmp: str, verbose: bool, trace_memory: bool) -> list:
+    from apcrg import apcrg
+
+    schema_injector = FaultInjector(settings["schema_latency"], settings["schema_failure_rate"], seed=settings["seed"])
+    source_registry = FakeSchemaRegistry(schema_injector, bulk=settings.get("bulk", True))
+    dest_registry = FakeSchemaRegistry(schema_injector, bulk=settings.get("bulk", True))
+    subjects = SchemaFleetGenerator(settings["subjects"], settings["versions"], seed=settings["seed"]).populate(source_registry)
+    with open(os.path.join(tmp, 'batch.yaml'), 'w') as file:
+        yaml.safe_dump({"schemas": [{"source-subject": subject} for subject in subjects]}, file)
+
+    registries = {httpx.URL(SOURCE_SCHEMA).host: source_registry, httpx.URL(DEST_SCHEMA).host: dest_registry}
+    transport = httpx.MockTransport(lambda request: registries[request.url.host].handle(request))
+    http_client = httpx.Client
+    schema_injector.pop_counts()
+
+    results = []
+    for run in range(scenario.runs):
+        apcrg.registry_clients.clear()
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(mock.patch.object(sys, 'argv', [scenario.tool] + get_argv(scenario, tmp)))
+            stack.enter_context(mock.patch('httpx.Client', side_effect=lambda **kwargs: http_client(**dict(kwargs, transport=transport))))
+            stack.enter_context(mock.patch.dict(os.environ))
+            os.environ.pop("APCRG_CACHE_DIR", None)
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+            error, elapsed, cpu, peak_memory = measure(apcrg.main, trace_memory)
+
+        calls, failures = pop_counts([schema_injector])
+        results.append(ScenarioResult(scenario.name, run + 1, error, elapsed, cpu, peak_memory, dest_registry.count_versions(), calls, failures))
+    return results
+
+def run_scenario(scenario: Scenario, args) -> list:
+    settings = dict(vars(args))
+    settings.update(scenario.overrides)
+    tmp = tempfile.mkdtemp(prefix=f"benchmark-{scenario.name}-")
+    try:
+        run = run_asset_registry if scenario.tool == 'asset_registry' else run_apcrg
+        return run(scenario, settings, tmp, args.verbose, not args.no_memory)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def print_results(results: list):
+    rows = [["SCENARIO", "RUN", "TIME (s)", "CPU (s)", "PEAK (MiB)", "OUTPUT", "CALLS", "FAILED", "TOP CALLS", "ERROR"]]
+    for result in results:
+        top_calls = sorted(result.calls.items(), key=lambda item: (-item[1], item[0]))[:3]
+        rows.append([
+            result.scenario,
+            result.run,
+            f"{result.elapsed:.2f}",
+            f"{result.cpu:.2f}",
+            '-' if result.peak_memory is None else f"{result.peak_memory / (1024 * 1024):.1f}",
+            result.output,
+            sum(result.calls.values()),
+            sum(result.failures.values()),
+            ", ".join(f"{name}={count}" for name, count in top_calls),
+            result.error or ''
+        ])
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+    for row in rows:
+        print("  ".join(str(row[i]).ljust(widths[i]) for i in range(len(row))).rstrip())
+
+def save_results(file_path: str, args, results: list):
+    report = {
+        "settings": vars(args),
+        "results": [result._asdict() for result in results]
+    }
+    with open(file_path, 'w', encoding='UTF8') as file:
+        json.dump(report, file, indent=2)
+
+def main():
+    args = parse_args()
+    scenarios = [scenario for scenario in SCENARIOS if (args.scenario is None) or (scenario.name in args.scenario)]
+
+    results = []
+    for scenario in scenarios:
+        print(f"Running [{scenario.name}]", file=sys.stderr)
+        results.extend(run_scenario(scenario, args))
+
+    print_results(results)
+    if args.json:
+        save_results(args.json, args, results)
+    if any(result.error for result in results):
+        exit(1)
+
+if __name__ == '__main__':
+    main()
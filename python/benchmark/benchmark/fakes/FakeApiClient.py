@@ -0,0 +1,36 @@
+import json
+from ..fleet.FleetGenerator import FleetGenerator
+from .FaultInjector import FaultInjector
+from .FakeResponse import FakeResponse
+
+class FakeApiClient:
+    API_VERSIONS = {'pods': 'v1', 'services': 'v1', 'configmaps': 'v1', 'secrets': 'v1', 'deployments': 'apps/v1', 'statefulsets': 'apps/v1', 'cronjobs': 'batch/v1', 'jobs': 'batch/v1'}
+    LIST_KINDS = {'pods': 'PodList', 'services': 'ServiceList', 'configmaps': 'ConfigMapList', 'secrets': 'SecretList', 'deployments': 'DeploymentList', 'statefulsets': 'StatefulSetList', 'cronjobs': 'CronJobList', 'jobs': 'JobList'}
+    METADATA_LIST_KIND = 'PartialObjectMetadataList'
+
+    def __init__(self, fleet: FleetGenerator, injector: FaultInjector) -> None:
+        super().__init__()
+        self._fleet = fleet
+        self._injector = injector
+
+    def encode_list(self, kind: str, namespace: str = None, label_selector: str = None, limit: int = None, _continue: str = None, metadata_only: bool = False) -> bytes:
+        items, latest_version = self._fleet.list_resources(kind, namespace, label_selector, metadata_only)
+        offset = int(_continue or 0)
+        end = len(items) if not limit else min(len(items), offset + int(limit))
+        metadata = {"resourceVersion": latest_version}
+        if end < len(items):
+            metadata["continue"] = str(end)
+        api_version = 'meta.k8s.io/v1' if metadata_only else FakeApiClient.API_VERSIONS[kind]
+        list_kind = FakeApiClient.METADATA_LIST_KIND if metadata_only else FakeApiClient.LIST_KINDS[kind]
+        return f'{{"apiVersion": "{api_version}", "kind": "{list_kind}", "metadata": {json.dumps(metadata)}, "items": [{", ".join(items[offset:end])}]}}'.encode('utf-8')
+
+    def call_api(self, resource_path: str, method: str, query_params: list = None, header_params: dict = None, _preload_content: bool = True, **kwargs) -> FakeResponse:
+        assert method == 'GET', f"unsupported method [{method}]"
+        parts = resource_path.strip('/').split('/')
+        namespace = parts[parts.index('namespaces') + 1] if ('namespaces' in parts) and (len(parts) > parts.index('namespaces') + 2) else None
+        kind = parts[-1]
+        query = dict(query_params or [])
+        metadata_only = f"as={FakeApiClient.METADATA_LIST_KIND}" in (header_params or {}).get('Accept', '')
+
+        self._injector.call(f"{'metadata' if metadata_only else 'call_api'}.list_{kind}")
+        return FakeResponse(self.encode_list(kind, namespace, query.get('labelSelector'), query.get('limit'), query.get('continue'), metadata_only))
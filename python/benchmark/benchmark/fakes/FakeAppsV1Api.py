@@ -0,0 +1,14 @@
+from .FakeKubernetesApi import FakeKubernetesApi
+
+class FakeAppsV1Api(FakeKubernetesApi):
+    def list_deployment_for_all_namespaces(self, **kwargs) -> any:
+        """:return: V1DeploymentList"""
+        return self._list('apps_v1.list_deployment_for_all_namespaces', 'deployments', 'V1DeploymentList', **kwargs)
+
+    def list_namespaced_deployment(self, namespace: str, **kwargs) -> any:
+        """:return: V1DeploymentList"""
+        return self._list('apps_v1.list_namespaced_deployment', 'deployments', 'V1DeploymentList', namespace=namespace, **kwargs)
+
+    def list_stateful_set_for_all_namespaces(self, **kwargs) -> any:
+        """:return: V1StatefulSetList"""
+        return self._list('apps_v1.list_stateful_set_for_all_namespaces', 'statefulsets', 'V1StatefulSetList', **kwargs)
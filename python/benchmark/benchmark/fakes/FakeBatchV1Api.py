@@ -0,0 +1,10 @@
+from .FakeKubernetesApi import FakeKubernetesApi
+
+class FakeBatchV1Api(FakeKubernetesApi):
+    def list_cron_job_for_all_namespaces(self, **kwargs) -> any:
+        """:return: V1CronJobList"""
+        return self._list('batch_v1.list_cron_job_for_all_namespaces', 'cronjobs', 'V1CronJobList', **kwargs)
+
+    def list_job_for_all_namespaces(self, **kwargs) -> any:
+        """:return: V1JobList"""
+        return self._list('batch_v1.list_job_for_all_namespaces', 'jobs', 'V1JobList', **kwargs)
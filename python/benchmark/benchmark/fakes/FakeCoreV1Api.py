@@ -0,0 +1,22 @@
+from .FakeKubernetesApi import FakeKubernetesApi
+
+class FakeCoreV1Api(FakeKubernetesApi):
+    def list_pod_for_all_namespaces(self, **kwargs) -> any:
+        """:return: V1PodList"""
+        return self._list('core_v1.list_pod_for_all_namespaces', 'pods', 'V1PodList', **kwargs)
+
+    def list_namespaced_pod(self, namespace: str, **kwargs) -> any:
+        """:return: V1PodList"""
+        return self._list('core_v1.list_namespaced_pod', 'pods', 'V1PodList', namespace=namespace, **kwargs)
+
+    def list_service_for_all_namespaces(self, **kwargs) -> any:
+        """:return: V1ServiceList"""
+        return self._list('core_v1.list_service_for_all_namespaces', 'services', 'V1ServiceList', **kwargs)
+
+    def list_config_map_for_all_namespaces(self, **kwargs) -> any:
+        """:return: V1ConfigMapList"""
+        return self._list('core_v1.list_config_map_for_all_namespaces', 'configmaps', 'V1ConfigMapList', **kwargs)
+
+    def list_secret_for_all_namespaces(self, **kwargs) -> any:
+        """:return: V1SecretList"""
+        return self._list('core_v1.list_secret_for_all_namespaces', 'secrets', 'V1SecretList', **kwargs)
@@ -0,0 +1,26 @@
+import docker
+from types import SimpleNamespace
+from .FaultInjector import FaultInjector
+
+class FakeDockerClient:
+    def __init__(self, fleets: list, injector: FaultInjector) -> None:
+        super().__init__()
+        self._fleets = fleets
+        self._injector = injector
+        self.images = SimpleNamespace(get_registry_data=self.get_registry_data, pull=self.pull)
+
+    def _get_image_metadata(self, image: str) -> dict:
+        for fleet in self._fleets:
+            metadata = fleet.get_image_metadata(image)
+            if metadata is not None:
+                return metadata
+        raise docker.errors.NotFound(f"404 Client Error: Not Found (manifest unknown: {image})")
+
+    def get_registry_data(self, image: str) -> SimpleNamespace:
+        self._injector.call('docker.get_registry_data')
+        return SimpleNamespace(id=self._get_image_metadata(image)["digest"])
+
+    def pull(self, image: str) -> SimpleNamespace:
+        self._injector.call('docker.pull')
+        metadata = self._get_image_metadata(image)
+        return SimpleNamespace(id=metadata["digest"], attrs={"Id": metadata["digest"], "Created": metadata["created"], "RepoTags": [image]})
@@ -0,0 +1,31 @@
+import json
+from types import SimpleNamespace
+from kubernetes.client import ApiClient
+from ..fleet.FleetGenerator import FleetGenerator
+from .FaultInjector import FaultInjector
+from .FakeApiClient import FakeApiClient
+from .FakeResponse import FakeResponse
+
+class FakeKubernetesApi:
+    def __init__(self, fleet: FleetGenerator, injector: FaultInjector) -> None:
+        super().__init__()
+        self._fleet = fleet
+        self._injector = injector
+        self._deserializer = ApiClient()
+        self.api_client = FakeApiClient(fleet, injector)
+
+    def _watch(self, kind: str, resource_version: str, label_selector: str) -> FakeResponse:
+        events, latest_version = self._fleet.list_events(kind, resource_version, label_selector)
+        lines = [f'{{"type": "{event_type}", "object": {encoded}}}\n'.encode('utf-8') for event_type, encoded in events]
+        lines.append(json.dumps({"type": "BOOKMARK", "object": {"kind": "Bookmark", "metadata": {"resourceVersion": latest_version}}}).encode('utf-8') + b'\n')
+        return FakeResponse(b''.join(lines), chunks=lines)
+
+    def _list(self, name: str, kind: str, return_type: str, namespace: str = None, label_selector: str = None, limit: int = None, _continue: str = None, watch: bool = False, resource_version: str = None, _preload_content: bool = True, **kwargs) -> any:
+        self._injector.call(name)
+        if watch:
+            return self._watch(kind, resource_version, label_selector)
+
+        data = self.api_client.encode_list(kind, namespace, label_selector, limit, _continue)
+        if not _preload_content:
+            return FakeResponse(data)
+        return self._deserializer.deserialize(SimpleNamespace(data=data), return_type)
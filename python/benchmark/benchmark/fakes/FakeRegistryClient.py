@@ -0,0 +1,38 @@
+import json
+import requests
+from dotmap import DotMap
+from .FaultInjector import FaultInjector
+
+class FakeRegistryClient:
+    def __init__(self, fleets: list, injector: FaultInjector) -> None:
+        super().__init__()
+        self._fleets = fleets
+        self._injector = injector
+        self._hooks = []
+
+    def add_response_hook(self, hook) -> None:
+        self._hooks.append(hook)
+
+    def _get(self, name: str, body: dict, status_code: int = 200) -> dict:
+        self._injector.call(name)
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = json.dumps(body).encode('utf-8')
+        for hook in self._hooks:
+            hook(response)
+        response.raise_for_status()
+        return body
+
+    def get_image_metadata(self, image: str) -> DotMap or None:
+        metadata = None
+        for fleet in self._fleets:
+            metadata = metadata or fleet.get_image_metadata(image)
+        if metadata is None:
+            self._get('registry.manifest', {"errors": [{"code": "MANIFEST_UNKNOWN", "message": "manifest unknown"}]}, 404)
+
+        manifest = self._get('registry.manifest', {"schemaVersion": 2, "mediaType": "application/vnd.docker.distribution.manifest.v2+json", "config": {"digest": f"sha256:{metadata['digest'][7:][::-1]}"}})
+        image_config = self._get('registry.blob', {"architecture": "amd64", "os": "linux", "created": metadata["created"], "config": {"Image": manifest["config"]["digest"]}})
+        return DotMap({
+            "digest": metadata["digest"],
+            "created": image_config["created"]
+        })
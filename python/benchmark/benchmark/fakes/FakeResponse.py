@@ -0,0 +1,24 @@
+class FakeResponse:
+    def __init__(self, data: bytes, status: int = 200, headers: dict = None, chunks: list = None) -> None:
+        super().__init__()
+        self.data = data
+        self.status = status
+        self.reason = 'OK' if status < 400 else 'Error'
+        self.headers = headers or {'Content-Type': 'application/json'}
+        self._chunks = chunks
+
+    def getheaders(self) -> dict:
+        return self.headers
+
+    def getheader(self, name: str, default: str = None) -> str or None:
+        return self.headers.get(name, default)
+
+    def stream(self, amt: int = None, decode_content: bool = True):
+        for chunk in (self._chunks if self._chunks is not None else [self.data]):
+            yield chunk
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        pass
@@ -0,0 +1,111 @@
+import httpx
+import json
+import threading
+from urllib.parse import unquote
+from .FaultInjector import FaultInjector
+
+class FakeSchemaRegistry:
+    def __init__(self, injector: FaultInjector, bulk: bool = True) -> None:
+        super().__init__()
+        self._injector = injector
+        self._bulk = bulk
+        self._lock = threading.RLock()
+        self._subjects = dict()
+        self._ids = dict()
+        self._next_id = 1
+
+    @staticmethod
+    def normalize(schema: str, schema_type: str) -> str:
+        return json.dumps(json.loads(schema), sort_keys=True) if schema_type in ['AVRO', 'JSON'] else schema
+
+    def _find_version(self, subject: str, schema: str, references: list, schema_type: str = 'AVRO') -> dict or None:
+        for version in self._subjects.get(subject, []):
+            if (version["schemaType"] == schema_type) and (FakeSchemaRegistry.normalize(version["schema"], schema_type) == FakeSchemaRegistry.normalize(schema, schema_type)) and (version["references"] == references):
+                return version
+        return None
+
+    def add(self, subject: str, schema: str, references: list = None, schema_type: str = 'AVRO', schema_id: int = None, version: int = None) -> dict:
+        references = list(references or [])
+        with self._lock:
+            existing = self._find_version(subject, schema, references, schema_type)
+            if existing is not None:
+                return existing
+            key = (schema_type, FakeSchemaRegistry.normalize(schema, schema_type), json.dumps(references, sort_keys=True))
+            schema_id = schema_id or self._ids.get(key) or self._next_id
+            self._ids[key] = schema_id
+            self._next_id = max(self._next_id, schema_id + 1)
+            versions = self._subjects.setdefault(subject, [])
+            result = {"subject": subject, "version": version or (1 + max([v["version"] for v in versions], default=0)), "id": schema_id, "schema": schema, "schemaType": schema_type, "references": references}
+            versions.append(result)
+            return result
+
+    def get_subjects(self) -> list:
+        with self._lock:
+            return list(self._subjects)
+
+    def count_versions(self) -> int:
+        with self._lock:
+            return sum(len(versions) for versions in self._subjects.values())
+
+    def _reply(self, status_code: int, body: any) -> httpx.Response:
+        return httpx.Response(status_code, json=body)
+
+    def _get(self, parts: list) -> httpx.Response:
+        if parts == ['subjects']:
+            return self._reply(200, list(self._subjects))
+        if parts == ['schemas']:
+            if not self._bulk:
+                return self._reply(404, {"error_code": 404, "message": "HTTP 404 Not Found"})
+            return self._reply(200, [version for versions in self._subjects.values() for version in versions])
+        if (len(parts) == 3) and (parts[:2] == ['schemas', 'ids']):
+            version = next((v for versions in self._subjects.values() for v in versions if str(v["id"]) == parts[2]), None)
+            return self._reply(404, {"error_code": 40403, "message": "Schema not found"}) if version is None else self._reply(200, {"schema": version["schema"], "schemaType": version["schemaType"], "references": version["references"]})
+        if (len(parts) == 3) and (parts[0] == 'subjects') and (parts[2] == 'versions'):
+            if parts[1] not in self._subjects:
+                return self._reply(404, {"error_code": 40401, "message": "Subject not found"})
+            return self._reply(200, [version["version"] for version in self._subjects[parts[1]]])
+        if (len(parts) == 4) and (parts[0] == 'subjects') and (parts[2] == 'versions'):
+            versions = self._subjects.get(parts[1]) or []
+            if len(versions) == 0:
+                return self._reply(404, {"error_code": 40401, "message": "Subject not found"})
+            version = versions[-1] if parts[3] == 'latest' else next((v for v in versions if str(v["version"]) == parts[3]), None)
+            return self._reply(404, {"error_code": 40402, "message": "Version not found"}) if version is None else self._reply(200, version)
+        return self._reply(404, {"error_code": 404, "message": "HTTP 404 Not Found"})
+
+    def _post(self, parts: list, body: dict) -> httpx.Response:
+        references = body.get("references") or []
+        if (len(parts) == 3) and (parts[0] == 'subjects') and (parts[2] == 'versions'):
+            for reference in references:
+                if not any(v["version"] == reference["version"] for v in self._subjects.get(reference["subject"], [])):
+                    return self._reply(422, {"error_code": 42201, "message": f"Invalid reference {reference}"})
+            result = self.add(parts[1], body["schema"], references, body.get("schemaType") or 'AVRO', body.get("id"), body.get("version"))
+            return self._reply(200, {"id": result["id"]})
+        if (len(parts) == 2) and (parts[0] == 'subjects'):
+            version = self._find_version(parts[1], body["schema"], references, body.get("schemaType") or 'AVRO')
+            return self._reply(404, {"error_code": 40403, "message": "Schema not found"}) if version is None else self._reply(200, version)
+        return self._reply(404, {"error_code": 404, "message": "HTTP 404 Not Found"})
+
+    @staticmethod
+    def get_endpoint(method: str, parts: list) -> str:
+        if method == 'POST':
+            return 'schema.register' if parts[-1:] == ['versions'] else 'schema.check_version'
+        if parts in [['subjects'], ['schemas']]:
+            return f"schema.list_{parts[0]}"
+        if parts[:2] == ['schemas', 'ids']:
+            return 'schema.get_by_id'
+        return 'schema.list_versions' if parts[-1:] == ['versions'] else 'schema.get_version'
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        raw_path = request.url.raw_path.decode('ascii').split('?')[0]
+        parts = [unquote(part) for part in raw_path.strip('/').split('/')]
+        start = next((i for i, part in enumerate(parts) if part in ['subjects', 'schemas']), len(parts))
+        parts = parts[start:]
+        try:
+            self._injector.call(FakeSchemaRegistry.get_endpoint(request.method, parts))
+        except Exception as e:
+            return self._reply(503, {"error_code": 50301, "message": str(e)})
+
+        with self._lock:
+            if request.method == 'POST':
+                return self._post(parts, json.loads(request.content or b'{}'))
+            return self._get(parts)
@@ -0,0 +1,34 @@
+import random
+import threading
+import time
+from typing import Callable
+
+class FaultInjector:
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, error_factory: Callable = None, seed: int = 0) -> None:
+        super().__init__()
+        assert latency >= 0, "latency must not be negative"
+        assert 0 <= failure_rate < 1, "failure rate must be between 0 and 1"
+        self._latency = latency
+        self._failure_rate = failure_rate
+        self._error_factory = error_factory or (lambda name: Exception(f"503 Server Error: Service Unavailable ({name})"))
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._calls = dict()
+        self._failures = dict()
+
+    def call(self, name: str, fail: bool = True) -> None:
+        with self._lock:
+            self._calls[name] = self._calls.get(name, 0) + 1
+            failed = fail and (self._random.random() < self._failure_rate)
+            if failed:
+                self._failures[name] = self._failures.get(name, 0) + 1
+        if self._latency > 0:
+            time.sleep(self._latency)
+        if failed:
+            raise self._error_factory(name)
+
+    def pop_counts(self) -> tuple:
+        with self._lock:
+            calls, failures = self._calls, self._failures
+            self._calls, self._failures = dict(), dict()
+        return calls, failures
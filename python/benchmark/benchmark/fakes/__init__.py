@@ -0,0 +1,10 @@
+from .FaultInjector import FaultInjector
+from .FakeResponse import FakeResponse
+from .FakeApiClient import FakeApiClient
+from .FakeKubernetesApi import FakeKubernetesApi
+from .FakeCoreV1Api import FakeCoreV1Api
+from .FakeAppsV1Api import FakeAppsV1Api
+from .FakeBatchV1Api import FakeBatchV1Api
+from .FakeDockerClient import FakeDockerClient
+from .FakeRegistryClient import FakeRegistryClient
+from .FakeSchemaRegistry import FakeSchemaRegistry
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import random
+import threading
+
+class FleetGenerator:
+    KINDS = ['pods', 'deployments', 'statefulsets', 'services', 'configmaps', 'secrets', 'cronjobs', 'jobs']
+    REGISTRY = 'registry.bench.local'
+    SIDECAR_IMAGES = [f"{REGISTRY}/platform/envoy:1.27.2", f"{REGISTRY}/platform/fluent-bit:2.1.8", f"{REGISTRY}/platform/vault-agent:1.14.1"]
+    CREATED_DATE = '2023-{month:02d}-{day:02d}T10:00:00.000000000Z'
+
+    def __init__(self, namespaces: int = 20, releases: int = 25, containers: int = 2, replicas: int = 2, images: int = 400, stale_ratio: float = 0.05, selector_only_ratio: float = 0.1, seed: int = 0) -> None:
+        super().__init__()
+        assert (namespaces > 0) and (releases > 0) and (containers > 0) and (replicas > 0) and (images > 0), "fleet sizes must be greater than 0"
+        self._containers = containers
+        self._replicas = replicas
+        self._stale_ratio = stale_ratio
+        self._selector_only_ratio = selector_only_ratio
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._resource_version = 1000
+        self._resources = {kind: dict() for kind in FleetGenerator.KINDS}
+        self._encoded = {kind: dict() for kind in FleetGenerator.KINDS}
+        self._encoded_metadata = {kind: dict() for kind in FleetGenerator.KINDS}
+        self._events = {kind: [] for kind in FleetGenerator.KINDS}
+        self._releases = []
+        self._image_pool = [f"{FleetGenerator.REGISTRY}/team-{i % 10}/service-{i:04d}:1.{i % 7}.0" for i in range(images)]
+        self._registry_images = dict()
+        self._builds = dict()
+
+        for namespace_index in range(namespaces):
+            namespace = f"team-{namespace_index:03d}"
+            for release_index in range(releases):
+                release = {
+                    "namespace": namespace,
+                    "name": f"svc-{release_index:04d}",
+                    "kind": 'statefulsets' if release_index % 10 == 0 else 'cronjobs' if release_index % 10 == 1 else 'deployments',
+                    "image": self._random.choice(self._image_pool),
+                    "selector_only": self._random.random() < self._selector_only_ratio,
+                    "app_label": release_index % 2 == 0,
+                    "generation": 0
+                }
+                self._releases.append(release)
+                self._add_release(release)
+            for pod_index in range(2):
+                self._put('pods', self._get_pod(namespace, f"node-agent-{pod_index}", {"app": f"node-agent-{pod_index}"}, [f"{FleetGenerator.REGISTRY}/platform/node-agent:3.2.0"]))
+        self._events = {kind: [] for kind in FleetGenerator.KINDS}
+
+    @staticmethod
+    def get_image_digest(image: str, generation: int = 0) -> str:
+        return f"sha256:{hashlib.sha256(f'{image}#{generation}'.encode('utf-8')).hexdigest()}"
+
+    def get_image_metadata(self, image: str) -> dict or None:
+        with self._lock:
+            return self._registry_images.get(image)
+
+    def get_images(self) -> list:
+        with self._lock:
+            return list(self._registry_images)
+
+    def get_resource_version(self) -> str:
+        with self._lock:
+            return str(self._resource_version)
+
+    def _register_image(self, image: str) -> dict:
+        metadata = self._registry_images.get(image)
+        if metadata is None:
+            seed = int(hashlib.sha256(image.encode('utf-8')).hexdigest()[:8], 16)
+            metadata = {"digest": FleetGenerator.get_image_digest(image), "created": FleetGenerator.CREATED_DATE.format(month=1 + seed % 12, day=1 + seed % 28)}
+            self._registry_images[image] = metadata
+        return metadata
+
+    def _get_metadata(self, namespace: str, name: str, labels: dict, annotations: dict = None) -> dict:
+        return {
+            "name": name,
+            "namespace": namespace,
+            "uid": hashlib.md5(f"{namespace}/{name}".encode('utf-8')).hexdigest(),
+            "labels": labels,
+            "annotations": annotations or {},
+            "resourceVersion": None
+        }
+
+    def _get_containers(self, images: list) -> list:
+        return [{"name": f"c{i}", "image": image, "imagePullPolicy": "IfNotPresent", "ports": [{"containerPort": 8080 + i, "protocol": "TCP"}], "resources": {"requests": {"cpu": "100m", "memory": "128Mi"}}} for i, image in enumerate(images)]
+
+    def _get_pod(self, namespace: str, name: str, labels: dict, images: list, stale: bool = False) -> dict:
+        statuses = []
+        for i, image in enumerate(images):
+            digest = self._register_image(image)["digest"]
+            digest = digest if not stale else FleetGenerator.get_image_digest(image, -1)
+            statuses.append({"name": f"c{i}", "image": image, "imageID": f"docker-pullable://{image.rsplit(':', 1)[0]}@{digest}", "ready": True, "restartCount": 0, "started": True, "containerID": f"containerd://{digest[7:]}"})
+        return {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": self._get_metadata(namespace, name, labels),
+            "spec": {"containers": self._get_containers(images), "nodeName": f"node-{len(name) % 16}", "serviceAccountName": "default"},
+            "status": {"phase": "Running", "podIP": "10.0.0.1", "containerStatuses": statuses}
+        }
+
+    def _get_release_images(self, release: dict) -> list:
+        return [release["image"]] + [FleetGenerator.SIDECAR_IMAGES[i % len(FleetGenerator.SIDECAR_IMAGES)] for i in range(self._containers - 1)]
+
+    def _get_helm_metadata(self, release: dict, name: str) -> dict:
+        version = release["image"].rsplit(':', 1)[1]
+        labels = {
+            "app.kubernetes.io/managed-by": "Helm",
+            "app.kubernetes.io/instance": release["name"],
+            "app.kubernetes.io/name": release["name"],
+            "app.kubernetes.io/version": version,
+            "helm.sh/chart": f"{release['name']}-0.{release['generation']}.0"
+        }
+        annotations = {
+            "meta.helm.sh/release-name": release["name"],
+            "meta.helm.sh/release-namespace": release["namespace"],
+            "deployment.kubernetes.io/revision": str(1 + release["generation"])
+        }
+        return self._get_metadata(release["namespace"], name, labels, annotations)
+
+    def _get_pod_labels(self, release: dict) -> dict:
+        if release["selector_only"] and release["app_label"]:
+            return {"app": f"{release['name']}-web"}
+        if release["selector_only"]:
+            return {"workload": f"{release['name']}-{release['generation']}"}
+        return {"app.kubernetes.io/instance": release["name"], "app.kubernetes.io/name": release["name"]}
+
+    def _get_workload(self, release: dict) -> dict:
+        template = {"metadata": {"labels": self._get_pod_labels(release)}, "spec": {"containers": self._get_containers(self._get_release_images(release))}}
+        selector = {"matchLabels": self._get_pod_labels(release)}
+        if release["kind"] == 'statefulsets':
+            return {"apiVersion": "apps/v1", "kind": "StatefulSet", "metadata": self._get_helm_metadata(release, release["name"]), "spec": {"replicas": self._replicas, "selector": selector, "serviceName": release["name"], "template": template}}
+        if release["kind"] == 'cronjobs':
+            return {"apiVersion": "batch/v1", "kind": "CronJob", "metadata": self._get_helm_metadata(release, release["name"]), "spec": {"schedule": "*/15 * * * *", "jobTemplate": {"spec": {"template": template}}}}
+        return {"apiVersion": "apps/v1", "kind": "Deployment", "metadata": self._get_helm_metadata(release, release["name"]), "spec": {"replicas": self._replicas, "selector": selector, "template": template}}
+
+    def _add_release(self, release: dict) -> None:
+        self._put(release["kind"], self._get_workload(release))
+        self._put('services', {"apiVersion": "v1", "kind": "Service", "metadata": self._get_helm_metadata(release, release["name"]), "spec": {"type": "ClusterIP", "ports": [{"port": 80, "targetPort": 8080, "protocol": "TCP"}], "selector": self._get_pod_labels(release)}})
+        self._put('configmaps', {"apiVersion": "v1", "kind": "ConfigMap", "metadata": self._get_helm_metadata(release, f"{release['name']}-config"), "data": {"application.yaml": "server:\n  port: 8080\n" * 8}})
+        self._put('secrets', {"apiVersion": "v1", "kind": "Secret", "metadata": self._get_helm_metadata(release, f"{release['name']}-secret"), "type": "Opaque", "data": {"password": "cGFzc3dvcmQ="}})
+        if release["kind"] == 'cronjobs':
+            self._put('jobs', {"apiVersion": "batch/v1", "kind": "Job", "metadata": self._get_helm_metadata(release, f"{release['name']}-{release['generation']}"), "spec": {"template": {"spec": {"containers": self._get_containers(self._get_release_images(release))}}}})
+            return
+        self._add_release_pods(release)
+
+    def _add_release_pods(self, release: dict) -> None:
+        stale = self._random.random() < self._stale_ratio
+        for replica in range(self._replicas):
+            pod_name = f"{release['name']}-{release['generation']}-{replica}"
+            self._put('pods', self._get_pod(release["namespace"], pod_name, self._get_pod_labels(release), self._get_release_images(release), stale))
+
+    def _remove_release_pods(self, release: dict) -> None:
+        for replica in range(self._replicas):
+            self._delete('pods', f"{release['namespace']}/{release['name']}-{release['generation']}-{replica}")
+        self._delete('jobs', f"{release['namespace']}/{release['name']}-{release['generation']}")
+
+    def _put(self, kind: str, resource: dict) -> None:
+        self._resource_version = self._resource_version + 1
+        resource["metadata"]["resourceVersion"] = str(self._resource_version)
+        key = f"{resource['metadata']['namespace']}/{resource['metadata']['name']}"
+        event_type = 'MODIFIED' if key in self._resources[kind] else 'ADDED'
+        self._resources[kind][key] = resource
+        self._encoded[kind][key] = json.dumps(resource)
+        self._encoded_metadata[kind][key] = json.dumps({"apiVersion": "meta.k8s.io/v1", "kind": "PartialObjectMetadata", "metadata": resource["metadata"]})
+        self._events[kind].append((self._resource_version, event_type, key, self._encoded[kind][key]))
+
+    def _delete(self, kind: str, key: str) -> None:
+        if key not in self._resources[kind]:
+            return
+        self._resource_version = self._resource_version + 1
+        self._resources[kind].pop(key)
+        self._encoded_metadata[kind].pop(key)
+        self._events[kind].append((self._resource_version, 'DELETED', key, self._encoded[kind].pop(key)))
+
+    def mutate(self, ratio: float) -> int:
+        with self._lock:
+            releases = self._random.sample(self._releases, int(len(self._releases) * ratio))
+            for release in releases:
+                self._remove_release_pods(release)
+                release["generation"] = release["generation"] + 1
+                release["image"] = f"{release['image'].rsplit(':', 1)[0]}:2.{release['generation']}.0"
+                self._add_release(release)
+            return len(releases)
+
+    def restart(self, ratio: float) -> int:
+        with self._lock:
+            releases = self._random.sample([release for release in self._releases if release["kind"] != 'cronjobs'], int(len(self._releases) * ratio))
+            for release in releases:
+                image = release["image"]
+                self._builds[image] = self._builds.get(image, 0) + 1
+                self._registry_images[image] = dict(self._register_image(image), digest=FleetGenerator.get_image_digest(image, self._builds[image]))
+                self._remove_release_pods(release)
+                self._add_release_pods(release)
+            return len(releases)
+
+    @staticmethod
+    def match_labels(labels: dict, label_selector: str) -> bool:
+        for requirement in [requirement.strip() for requirement in (label_selector or '').split(',') if requirement.strip()]:
+            if '!=' in requirement:
+                label, value = requirement.split('!=', 1)
+                if labels.get(label.strip()) == value.strip():
+                    return False
+            elif '=' in requirement:
+                label, value = requirement.replace('==', '=').split('=', 1)
+                if labels.get(label.strip()) != value.strip():
+                    return False
+            elif requirement.startswith('!'):
+                if requirement[1:] in labels:
+                    return False
+            elif requirement not in labels:
+                return False
+        return True
+
+    def list_resources(self, kind: str, namespace: str = None, label_selector: str = None, metadata_only: bool = False) -> tuple:
+        encoded = self._encoded_metadata if metadata_only else self._encoded
+        with self._lock:
+            resources = [(key, encoded[kind][key]) for key, resource in self._resources[kind].items() if ((namespace is None) or (resource["metadata"]["namespace"] == namespace)) and FleetGenerator.match_labels(resource["metadata"]["labels"] or {}, label_selector)]
+            return [encoded for _, encoded in sorted(resources)], str(self._resource_version)
+
+    def list_events(self, kind: str, resource_version: str, label_selector: str = None) -> tuple:
+        with self._lock:
+            events = [(event_type, encoded) for event_version, event_type, _, encoded in self._events[kind] if event_version > int(resource_version or 0)]
+            events = [(event_type, encoded) for event_type, encoded in events if FleetGenerator.match_labels(json.loads(encoded)["metadata"]["labels"] or {}, label_selector)]
+            return events, str(self._resource_version)
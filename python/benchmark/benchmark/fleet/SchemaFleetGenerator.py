@@ -0,0 +1,40 @@
+import json
+import random
+from ..fakes.FakeSchemaRegistry import FakeSchemaRegistry
+
+class SchemaFleetGenerator:
+    def __init__(self, subjects: int = 200, versions: int = 3, reference_ratio: float = 0.2, seed: int = 0) -> None:
+        super().__init__()
+        assert (subjects > 0) and (versions > 0), "schema fleet sizes must be greater than 0"
+        self._subjects = subjects
+        self._versions = versions
+        self._reference_ratio = reference_ratio
+        self._seed = seed
+
+    @staticmethod
+    def get_schema(name: str, fields: int, reference: str = None) -> str:
+        schema_fields = [{"name": f"field_{i}", "type": ["null", "string"], "default": None} for i in range(fields)]
+        if reference is not None:
+            schema_fields.append({"name": "common", "type": ["null", reference], "default": None})
+        return json.dumps({"type": "record", "name": name, "namespace": "bench", "fields": schema_fields})
+
+    def populate(self, registry: FakeSchemaRegistry) -> list:
+        rng = random.Random(self._seed)
+        common_subjects = [f"bench.common.Common{i:03d}-value" for i in range(max(1, self._subjects // 10))]
+        for i, subject in enumerate(common_subjects):
+            registry.add(subject, SchemaFleetGenerator.get_schema(f"Common{i:03d}", 4))
+
+        standalone_subjects = []
+        for i in range(self._subjects):
+            subject = f"bench.topic_{i:04d}-value"
+            common = rng.randrange(len(common_subjects)) if rng.random() < self._reference_ratio else None
+            for version in range(self._versions):
+                if common is None:
+                    registry.add(subject, SchemaFleetGenerator.get_schema(f"Topic{i:04d}", 2 + version))
+                else:
+                    reference = {"name": f"bench.Common{common:03d}", "subject": common_subjects[common], "version": 1}
+                    registry.add(subject, SchemaFleetGenerator.get_schema(f"Topic{i:04d}", 2 + version, reference["name"]), [reference])
+            if common is None:
+                standalone_subjects.append(subject)
+
+        return standalone_subjects
@@ -0,0 +1,2 @@
+from .FleetGenerator import FleetGenerator
+from .SchemaFleetGenerator import SchemaFleetGenerator